@@ -17,3 +17,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fsae_backend.settings')
 
 application = get_asgi_application()
+
+# Pick up ingestion jobs interrupted by the last restart, without waiting for a new upload
+from fsae_backend_app.jobs import resume_interrupted_jobs  # noqa: E402
+
+resume_interrupted_jobs()
@@ -22,6 +22,52 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 DATA_DIR = BASE_DIR / 'fsae_backend_app' / 'ld_parser' / 'data'
 
+# Parsed ld files are cached here by content hash, trimmed back to LD_CACHE_MAX_BYTES
+LD_CACHE_DIR = DATA_DIR / 'cache'
+LD_CACHE_MAX_BYTES = int(os.getenv("LD_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+
+# Set to a directory to also export each uploaded rate group as CSV, for debugging
+LD_CSV_EXPORT_DIR = os.getenv("LD_CSV_EXPORT_DIR")
+
+# Where full-rate channel segments are kept: "firestore" documents, or "s3" objects in
+# AWS_STORAGE_BUCKET_NAME for long runs whose segments would be costly to keep in Firestore
+LD_SEGMENT_STORAGE = os.getenv("LD_SEGMENT_STORAGE", "firestore")
+
+# Statistics computed from every sample of a run at ingestion and stored on its ecu-data
+# document as "key-points", keyed by label. Stats are "max", "min", "mean", and "laps" (for
+# a lap or beacon counter, the number of values it passes through: its highest value minus
+# its lowest, plus one). Labels whose channel was not logged are left out
+RUN_KEY_POINTS = [
+    {"label": "Highest Coolant Temperature", "channel": "Coolant Temperature", "stat": "max"},
+    {"label": "Lowest Engine Oil Pressure", "channel": "Engine Oil Pressure", "stat": "min"},
+    {"label": "Top Speed", "channel": "Speed", "stat": "max"},
+    {"label": "Average Speed", "channel": "Speed", "stat": "mean"},
+    {"label": "Lap Count", "channel": "Lap Number", "stat": "laps"},
+]
+
+# Run data read from Firestore is cached here, and invalidated when a run is re-ingested.
+# MemoryCappedCache is per process; point "run-data" at a shared backend (e.g. Redis) to share
+# entries and invalidations between processes
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'run-data': {
+        'BACKEND': 'fsae_backend_app.run_cache.MemoryCappedCache',
+        # Runs do not change once ingested; entries leave by eviction or invalidation
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_BYTES': int(os.getenv("RUN_DATA_CACHE_MAX_BYTES", 256 * 1024 ** 2)),
+            'MAX_ENTRIES': 100000,
+        },
+    },
+}
+RUN_DATA_CACHE = 'run-data'
+
+# Uploaded ld files wait here for the background ingestion workers
+INGESTION_DIR = DATA_DIR / 'jobs'
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", 2))
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
@@ -108,6 +154,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Ingestion workers write job progress concurrently with request threads
+        'OPTIONS': {
+            'timeout': 20,
+        },
     }
 }
 
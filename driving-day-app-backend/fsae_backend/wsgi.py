@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fsae_backend.settings')
 
 application = get_wsgi_application()
+
+# Pick up ingestion jobs interrupted by the last restart, without waiting for a new upload
+from fsae_backend_app.jobs import resume_interrupted_jobs  # noqa: E402
+
+resume_interrupted_jobs()
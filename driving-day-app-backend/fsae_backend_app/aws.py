@@ -129,4 +129,31 @@ def delete_s3_folder(prefix, bucket_name=None):
         if delete_batch['Objects']:
             client.delete_objects(Bucket=bucket, Delete=delete_batch)
     except ClientError as e:
-        raise RuntimeError(f"Failed to delete S3 folder {prefix}: {e}")
\ No newline at end of file
+        raise RuntimeError(f"Failed to delete S3 folder {prefix}: {e}")
+
+def delete_from_s3(s3_keys, bucket_name=None):
+    """
+    Delete the objects with the given keys from the S3 bucket. Keys that do not exist are ignored.
+
+    Args:
+        s3_keys: The keys (paths) of the objects to delete.
+        bucket_name: Optional override for the bucket name. Defaults to settings.AWS_STORAGE_BUCKET_NAME.
+
+    Raises:
+        RuntimeError: If deletion fails.
+    """
+    bucket = bucket_name or settings.AWS_STORAGE_BUCKET_NAME
+    client = get_s3_client()
+
+    try:
+        # delete_objects takes at most 1000 keys per request
+        for start in range(0, len(s3_keys), 1000):
+            response = client.delete_objects(Bucket=bucket, Delete={
+                'Objects': [{'Key': key} for key in s3_keys[start:start + 1000]],
+                'Quiet': True,
+            })
+            if response.get('Errors'):
+                error = response['Errors'][0]
+                raise RuntimeError(f"Failed to delete S3 object {error.get('Key')}: {error.get('Message')}")
+    except ClientError as e:
+        raise RuntimeError(f"Failed to delete S3 objects: {e}")
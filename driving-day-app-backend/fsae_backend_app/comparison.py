@@ -0,0 +1,73 @@
+"""
+comparison.py
+
+Aligns channels of several runs onto one shared time or distance axis, so laps by
+different drivers can be overlaid point for point.
+"""
+import numpy as np
+from .decimation import decimate_mean
+
+
+def align_runs(runs, channels, points, distance_channel=None, start=None, end=None):
+    """
+    Resamples channels of several runs onto a shared, evenly spaced axis.
+
+    Each series is first averaged down to about `points` samples, so that the resampling
+    does not alias, then linearly interpolated at the axis positions. When aligning on
+    distance, the distance channel is made non-decreasing first, since a distance counter
+    can step back slightly while the car is stationary. Positions outside a run are NaN.
+
+    Args:
+        runs (dict): Packed data keyed by run title, as returned by `get_packed_run_data`.
+        channels (list of str): The channels to align; channels missing from a run are skipped.
+        points (int): The number of axis positions.
+        distance_channel (str, optional): Align on the values of this channel instead of on
+            seconds from the start of each run.
+        start, end (float, optional): The range of the axis; by default it spans every run.
+
+    Returns:
+        tuple: (axis, aligned), the float64 axis positions and a dict of float32 arrays keyed
+            by run title then channel name.
+
+    Raises:
+        ValueError: If a run lacks the distance channel.
+    """
+    positions = {}
+    for title, run in runs.items():
+        if distance_channel is None:
+            length = max((len(run["channels"].get(name, ())) for name in channels), default=0)
+            positions[title] = run["start"] + np.arange(length) / run["frequency"]
+        else:
+            distance = run["channels"].get(distance_channel)
+            if distance is None:
+                raise ValueError(f"Run {title} has no '{distance_channel}' channel")
+            positions[title] = np.maximum.accumulate(distance.astype(np.float64))
+
+    bounds = [(x[0], x[-1]) for x in positions.values() if len(x)]
+    low = start if start is not None else min((b[0] for b in bounds), default=0.0)
+    high = end if end is not None else max((b[1] for b in bounds), default=0.0)
+    axis = np.linspace(low, high, points) if high > low else np.array([low], dtype=np.float64)
+
+    aligned = {}
+    for title, run in runs.items():
+        x = positions[title]
+        aligned[title] = {}
+        for name in channels:
+            values = run["channels"].get(name)
+            if values is None:
+                continue
+            count = min(len(x), len(values))
+            if count == 0:
+                aligned[title][name] = np.full(len(axis), np.nan, dtype=np.float32)
+                continue
+            # Average down to about the axis spacing within this run's own span
+            outside = (axis < x[0]) | (axis > x[count - 1])
+            factor = max(1, count // max(len(axis) - np.count_nonzero(outside), 1))
+            # Bucket means sit inside the run, so its first and last samples pin down the ends;
+            # positions stay float64, as float32 cannot resolve a sample period late in a long run
+            xp = np.concatenate(([x[0]], decimate_mean(x[:count], factor, np.float64), [x[count - 1]]))
+            fp = np.concatenate(([values[0]], decimate_mean(values[:count], factor), [values[count - 1]]))
+            series = np.interp(axis, xp, fp)
+            series[outside] = np.nan
+            aligned[title][name] = series.astype(np.float32)
+    return axis, aligned
@@ -0,0 +1,126 @@
+"""
+decimation.py
+
+Reduces full-rate channel series to the resolution a client asks for, so charts never
+have to download more points than they can draw.
+"""
+import numpy as np
+
+
+def decimate_mean(values, factor, dtype=np.float32):
+    """
+    Averages consecutive buckets of `factor` samples; the last bucket may be partial.
+
+    Args:
+        values (np.ndarray): A 1D series of samples.
+        factor (int): The number of samples per output point.
+        dtype (np.dtype, optional): The type of the means; float32 by default, as samples are.
+
+    Returns:
+        np.ndarray: One mean per bucket.
+    """
+    if factor <= 1 or len(values) == 0:
+        return values
+    full = len(values) // factor
+    out = np.empty(-(-len(values) // factor), dtype=dtype)
+    out[:full] = values[:full * factor].reshape(full, factor).mean(axis=1, dtype=np.float64)
+    if full < len(out):
+        out[full] = values[full * factor:].mean(dtype=np.float64)
+    return out
+
+
+def _buckets(values, buckets):
+    """
+    Splits `values` into `buckets` contiguous buckets whose widths differ by at most one.
+
+    Returns:
+        list of tuple: (offset of the first bucket, 2D view with one bucket per row); at most
+            two views, for the wider buckets then the narrower ones.
+    """
+    width, wider = divmod(len(values), buckets)
+    split = wider * (width + 1)
+    views = []
+    if wider:
+        views.append((0, values[:split].reshape(wider, width + 1)))
+    if width:
+        views.append((split, values[split:].reshape(buckets - wider, width)))
+    return views
+
+
+def min_max(values, points):
+    """
+    Picks the minimum and maximum sample of each of `points // 2` buckets.
+
+    Keeps every spike, so the envelope of the series is drawn exactly however far it is
+    reduced.
+
+    Args:
+        values (np.ndarray): A 1D series of samples.
+        points (int): The maximum number of samples to keep.
+
+    Returns:
+        np.ndarray: The indices of the kept samples, in time order.
+    """
+    if len(values) <= points:
+        return np.arange(len(values))
+    if points < 2:
+        if points < 1:
+            return np.arange(0)
+        # Room for one extreme only: keep the one further from the mean
+        low, high = int(values.argmin()), int(values.argmax())
+        mean = values.mean(dtype=np.float64)
+        return np.array([high if values[high] - mean >= mean - values[low] else low])
+    indices = []
+    for offset, grid in _buckets(values, max(1, points // 2)):
+        starts = offset + np.arange(len(grid)) * grid.shape[1]
+        indices += [starts + grid.argmin(axis=1), starts + grid.argmax(axis=1)]
+    return np.unique(np.concatenate(indices))
+
+
+def lttb(values, points):
+    """
+    Picks samples with Largest-Triangle-Three-Buckets.
+
+    The first and last samples are always kept. The rest are split into `points - 2`
+    buckets, and from each bucket the sample forming the largest triangle with the previously
+    kept sample and the mean of the next bucket is kept. Bucket means and triangle areas are
+    computed with NumPy; only the walk from one bucket to the next is a Python loop, so the
+    cost is O(len(values)) plus a small constant per output point.
+
+    Args:
+        values (np.ndarray): A 1D series of samples, evenly spaced in time.
+        points (int): The number of samples to keep.
+
+    Returns:
+        np.ndarray: The indices of the kept samples, in time order.
+    """
+    n = len(values)
+    if n <= points:
+        return np.arange(n)
+    if points < 3:
+        return np.array([0, n - 1][:max(points, 0)], dtype=np.int64)
+
+    inner = values[1:n - 1].astype(np.float64)
+    edges = 1 + (np.arange(points - 1) * (n - 2)) // (points - 2)
+    sums = np.add.reduceat(inner, edges[:-1] - 1)
+    counts = np.diff(edges)
+    mean_x = (edges[:-1] + edges[1:] - 1) / 2
+    mean_y = sums / counts
+    # The bucket after the last one is the final sample
+    mean_x = np.append(mean_x, n - 1)
+    mean_y = np.append(mean_y, values[n - 1])
+
+    kept = np.empty(points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    ax, ay = 0.0, float(values[0])
+    for b in range(points - 2):
+        lo, hi = edges[b], edges[b + 1]
+        cx, cy = mean_x[b + 1], mean_y[b + 1]
+        xs = np.arange(lo, hi)
+        ys = inner[lo - 1:hi - 1]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((ax - cx) * (ys - ay) - (ax - xs) * (cy - ay))
+        pick = lo + int(area.argmax())
+        kept[b + 1] = pick
+        ax, ay = float(pick), float(values[pick])
+    return kept
@@ -9,7 +9,13 @@ Any logic or operations related to Firestore must be placed in this module to
 maintain separation of concerns and ensure a modular codebase.
 """
 import csv
+import math
 import os
+import random
+import time
+import zlib
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from .firebase import firebase_app
 from firebase_admin import firestore
 
@@ -17,6 +23,149 @@ db = firestore.client()
 # Declares the MAX number of entries to read into Firebase
 # 1200 seconds = 20 minutes
 max_entries_counter = 1200
+# Firestore rejects write batches with more than 500 operations
+max_batch_size = 500
+# Values per summary document; Firestore allows 40,000 index entries per document
+max_summary_values = 20000
+# Samples per packed channel document: 512 KiB of float32, under Firestore's 1 MiB document limit
+packed_chunk_samples = 131072
+packed_encoding = 'float32-shuffle-zlib'
+# Packed documents per write batch, keeping each commit well under Firestore's 10 MiB request limit
+packed_batch_size = 16
+# Packed segments stored outside Firestore (e.g. S3 uploads) at once
+packed_store_workers = 8
+
+
+class RunNotFound(LookupError):
+    """Raised when a run has none of the data asked for, as opposed to failing to read it."""
+
+
+class BatchWriter(object):
+    """
+    Buffers document writes and commits them as Firestore write batches.
+
+    Up to `max_in_flight` batches are committed concurrently on a thread pool. A batch that
+    fails is retried with exponential backoff and jitter; if it still fails after
+    `max_retries` attempts, the error is raised from `close`.
+
+    Example:
+        with BatchWriter() as writer:
+            writer.set(collection_ref.document('data_000000'), row)
+        print(writer.rows_per_second)
+    """
+
+    def __init__(self, client=None, batch_size=max_batch_size, max_in_flight=4, max_retries=5, backoff=0.5):
+        """
+        Args:
+            client: The Firestore client to create batches from. Defaults to the shared `db`;
+                    any object with a `batch()` method (e.g. an emulator client or a fake) works.
+            batch_size (int): Operations per batch, capped at Firestore's limit of 500.
+            max_in_flight (int): The number of batches that may be committing at once.
+            max_retries (int): Attempts per batch before giving up.
+            backoff (float): The delay in seconds before the first retry; doubled per retry.
+        """
+        self.client = client or db
+        self.batch_size = min(batch_size, max_batch_size)
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.rows_written = 0
+        self._pending = []
+        self._in_flight = set()
+        self._errors = []
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self._started = time.monotonic()
+        self._elapsed = None
+
+    def set(self, doc_ref, data):
+        """
+        Queue a `set` of `data` on `doc_ref`, committing a batch once it is full.
+        """
+        self._pending.append((doc_ref, data))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def delete(self, doc_ref):
+        """
+        Queue a `delete` of `doc_ref`, committing a batch once it is full.
+        """
+        self.set(doc_ref, None)
+
+    def flush(self):
+        """
+        Submit the queued writes as a batch, waiting first if too many batches are in flight.
+        """
+        if not self._pending:
+            return
+        while len(self._in_flight) >= self.max_in_flight:
+            self._reap(wait(self._in_flight, return_when=FIRST_COMPLETED).done)
+        ops, self._pending = self._pending, []
+        self._in_flight.add(self._executor.submit(self._commit, ops))
+
+    def close(self):
+        """
+        Commit everything still queued and wait for all batches to finish.
+
+        Raises:
+            Exception: The error of the first batch that could not be committed.
+        """
+        try:
+            self.flush()
+            self._reap(wait(self._in_flight).done)
+        finally:
+            self._executor.shutdown(wait=True)
+            if self._elapsed is None:
+                self._elapsed = time.monotonic() - self._started
+        if self._errors:
+            raise self._errors[0]
+
+    @property
+    def rows_per_second(self):
+        """
+        Committed documents per second since the writer was created (until it was closed).
+        """
+        elapsed = self._elapsed if self._elapsed is not None else time.monotonic() - self._started
+        return self.rows_written / elapsed if elapsed > 0 else 0.0
+
+    def _reap(self, done):
+        for future in done:
+            self._in_flight.discard(future)
+            try:
+                self.rows_written += future.result()
+            except Exception as e:
+                self._errors.append(e)
+
+    def _commit(self, ops):
+        for attempt in range(self.max_retries):
+            try:
+                batch = self.client.batch()
+                for doc_ref, data in ops:
+                    if data is None:
+                        batch.delete(doc_ref)
+                    else:
+                        batch.set(doc_ref, data)
+                batch.commit()
+                return len(ops)
+            except Exception as e:
+                if attempt == self.max_retries - 1:
+                    raise
+                delay = self.backoff * 2 ** attempt * (1 + random.random())
+                print(f"Batch of {len(ops)} writes failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Still drain what was submitted, but let the original error propagate
+            try:
+                self.close()
+            except Exception as e:
+                print(f"An error occurred while committing batched writes: {e}")
 
 def add_driver(data):
     """
@@ -156,6 +305,437 @@ def upload_csv_to_firestore(csv_file_path, driver_id):
     except Exception as e:
         print(f"An error occurred while uploading CSV to Firestore: {e}")
         
+def upload_run_to_firestore(main_document, columns, blocks, frequency, driver_id, key_points=None):
+    """
+    Uploads one rate group of a run to a Firestore subcollection, straight from its sample blocks.
+
+    Rows are kept on whole-second boundaries and uploaded with their numeric types, under the
+    same document layout as `upload_csv_to_firestore`.
+
+    Args:
+        main_document (str): The run document name, formatted as `YYYY-MM-DD-<title>-<freq>-hz`.
+        columns (list): The channel names, one per block column.
+        blocks (iterable): Consecutive 2D NumPy arrays of samples, one row per sample.
+        frequency (int): The recording frequency of the rate group in Hz.
+        driver_id (str): The ID of the driver of the run.
+        key_points (dict, optional): Statistics of the whole run, keyed by label, stored on the
+            run document under "key-points".
+
+    Raises:
+        Exception: The Firestore error, if a write fails after its retries.
+
+    Returns:
+        None
+
+    Example:
+        upload_run_to_firestore('2024-11-23-endurance-100-hz', ['Speed'], blocks, 100, driver_id)
+    """
+    # Document referencing to correctly insert into Firebase hierarchy
+    # ecu-data/`main_document`/`data`/(actual data)
+    main_collection = 'ecu-data'
+    subcollection = 'data'
+
+    main_doc_ref = db.collection(main_collection).document(main_document)
+
+    main_doc_ref.set({
+        "run-date": main_document[0:10],
+        "driver-id": driver_id,
+        "key-points": key_points or {}
+    })
+
+    subcollection_ref = main_doc_ref.collection(subcollection)
+
+    with BatchWriter() as writer:
+        for second, values in _whole_second_rows(blocks, frequency):
+            # If the number of rows EXCEEDS the max_entries_counter
+            if second >= max_entries_counter:
+                print(f"Reached the max entry number: {second * frequency}")
+                break
+
+            # When the run stops giving complete values (a channel ended; see `_whole_second_rows`)
+            if any(value is None for value in values):
+                print(f"Stopping processing at row {second * frequency}.")
+                break
+
+            doc_id = f'data_{second:06}'
+            writer.set(subcollection_ref.document(doc_id), dict(zip(columns, values)))
+
+    print(f"All data has been successfully uploaded to Firestore under document '{main_document}' "
+          f"({writer.rows_written} rows, {writer.rows_per_second:.0f} rows/sec).")
+
+
+def _whole_second_rows(blocks, frequency):
+    """
+    Picks the rows that fall on whole seconds out of consecutive sample blocks.
+
+    Args:
+        blocks (iterable): Consecutive 2D NumPy arrays of samples, one row per sample.
+        frequency (int): The recording frequency of the samples in Hz.
+
+    Yields:
+        tuple: The second number and the row's values as Python numbers, with None for NaN.
+    """
+    row_number = 0
+    second = 0
+    for block in blocks:
+        # Offset of the first whole-second row within this block
+        first = -row_number % frequency
+        rows = block[first::frequency]
+        has_nan = False
+        if rows.dtype.kind == 'f':
+            # Rounded as `rounded_floats` rounds summaries and packed samples, so they all agree
+            rows = significant_digits(rows)
+            has_nan = bool(np.isnan(rows).any())
+        for values in rows.tolist():
+            if has_nan:
+                values = [None if math.isnan(value) else value for value in values]
+            yield second, values
+            second += 1
+        row_number += len(block)
+
+
+def upload_run_summary_to_firestore(main_document, columns, rollups):
+    """
+    Uploads min/max/mean rollups of one rate group of a run as a few compact documents.
+
+    Documents are stored under ecu-data/`main_document`/summary, each holding a span of
+    buckets at one resolution for a set of channels, with one array per statistic:
+
+        {"resolution": 10, "start": 0, "channels": {"Speed": {"min": [...], "max": [...], "mean": [...]}}}
+
+    Buckets with no samples are stored as null.
+
+    Args:
+        main_document (str): The run document name, formatted as `YYYY-MM-DD-<title>-<freq>-hz`.
+        columns (list): The channel names, one per rollup row.
+        rollups (dict): The rollups from `ld_parser.summary.compute_rollups`.
+
+    Raises:
+        Exception: The Firestore error, if a write fails after its retries.
+
+    Returns:
+        None
+    """
+    summary_ref = db.collection('ecu-data').document(main_document).collection('summary')
+
+    with BatchWriter() as writer:
+        for resolution, stats in rollups.items():
+            for doc_id, doc in _summary_documents(columns, resolution, stats):
+                writer.set(summary_ref.document(doc_id), doc)
+
+    print(f"Summary of '{main_document}' uploaded at {', '.join(f'{r}s' for r in rollups)} "
+          f"({writer.rows_written} documents).")
+
+
+def _summary_documents(columns, resolution, stats):
+    """
+    Splits the rollups at one resolution into documents of at most `max_summary_values` values.
+
+    Yields:
+        tuple: The document ID and the document.
+    """
+    buckets = stats['mean'].shape[1]
+    # Long runs are split by time first, then channels are packed into each span
+    span = max(1, min(buckets, max_summary_values // len(stats)))
+    channels_per_doc = max(1, max_summary_values // (len(stats) * span))
+
+    part = 0
+    for start in range(0, buckets, span):
+        for first in range(0, len(columns), channels_per_doc):
+            channels = {}
+            for i in range(first, min(first + channels_per_doc, len(columns))):
+                channels[columns[i]] = {stat: rounded_floats(values[i, start:start + span])
+                                        for stat, values in stats.items()}
+            yield f'{resolution}s-{part:03}', {
+                "resolution": resolution,
+                "start": start,
+                "channels": channels,
+            }
+            part += 1
+
+
+def rounded_floats(values):
+    """
+    Converts an array of samples or rollup values to a list of Python floats, with None for NaN.
+    """
+    return [None if math.isnan(value) else value for value in significant_digits(values).tolist()]
+
+
+def significant_digits(values):
+    """
+    Rounds an array of samples to the 7 significant digits a float32 holds, as float64, so
+    that 10.4 is stored as 10.4 rather than 10.40000057.
+    """
+    values = np.float64(values)
+    nonzero = np.isfinite(values) & (values != 0)
+    magnitude = np.floor(np.log10(np.abs(values, where=nonzero, out=np.ones_like(values))))
+    scale = 10.0 ** (6 - magnitude)
+    return np.round(values * scale) / scale
+
+
+def get_run_summary(run_title, resolution=None, categories_list=[]):
+    """
+    Retrieves the min/max/mean rollups of a run, as stored by `upload_run_summary_to_firestore`.
+
+    Args:
+        run_title (str): The run document name, formatted as `YYYY-MM-DD-<title>-<freq>-hz`.
+        resolution (int, optional): Only return rollups with this bucket width in seconds.
+        categories_list (list, optional): Only return these channels.
+
+    Returns:
+        dict: Keyed by resolution, each with the bucket start times in seconds and the
+              min/max/mean series of each channel:
+              {10: {"time": [0, 10, ...], "channels": {"Speed": {"min": [...], ...}}}}
+        None: If an error occurs during the operation.
+    """
+    try:
+        query = db.collection('ecu-data').document(run_title).collection('summary')
+        if resolution is not None:
+            query = query.where('resolution', '==', int(resolution))
+        if len(categories_list) > 0:
+            query = query.select(['resolution', 'start'] + [f'channels.`{c}`' for c in categories_list])
+
+        return merge_summary_documents(doc.to_dict() for doc in query.stream())
+
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling run summary data: {e}")
+        return None
+
+
+def merge_summary_documents(docs):
+    """
+    Merges summary documents, in any order, into the series returned by `get_run_summary`.
+    """
+    summary = {}
+    for doc in sorted(docs, key=lambda d: (d['resolution'], d['start'])):
+        res = summary.setdefault(doc['resolution'], {"time": [], "channels": {}})
+        span = 0
+        for name, stats in doc.get('channels', {}).items():
+            channel = res["channels"].setdefault(name, {"min": [], "max": [], "mean": []})
+            for stat, values in stats.items():
+                channel[stat].extend(values)
+            span = len(stats['mean'])
+        # Several documents share a span when its channels were split across them
+        covered = len(res["time"])
+        end = doc['start'] + span
+        if end > covered:
+            res["time"].extend(range(covered * doc['resolution'], end * doc['resolution'], doc['resolution']))
+    return summary
+
+
+def upload_packed_run_to_firestore(main_document, series, frequency, store_segment=None, delete_segments=None):
+    """
+    Uploads one rate group of a run channel by channel, as compressed segments of each full series.
+
+    Every sample is kept, at the channel's own rate and for the whole run. Each segment holds
+    up to `packed_chunk_samples` consecutive samples of one channel, so reading a channel
+    costs one read per segment rather than one per second, and no document grows with the
+    length of the run.
+
+    Segments are stored as documents under ecu-data/`main_document`/channels, or handed to
+    `store_segment` (e.g. to put them in S3), `packed_store_workers` at a time, with only
+    their index kept in Firestore:
+
+        {"channel": "Speed", "frequency": 100, "part": 0, "start": 0, "count": 131072,
+         "encoding": "float32-shuffle-zlib", "data": <bytes>}
+
+    A manifest document, written once every segment is stored, maps each channel to its
+    segments for `get_packed_run_data`. This is written alongside the per-second row layout,
+    which is kept for compatibility. Segments of an earlier upload of the run that this one
+    did not overwrite (fewer channels or a shorter run) are deleted after the manifest is.
+
+    Args:
+        main_document (str): The run document name, formatted as `YYYY-MM-DD-<title>-<freq>-hz`.
+        series (iterable): (channel name, 1D NumPy array) pairs.
+        frequency (int): The recording frequency of the rate group in Hz.
+        store_segment (callable, optional): Called with a segment key and its bytes to store
+            segments outside Firestore; see `packed_segment_key`.
+        delete_segments (callable, optional): Called with a list of segment keys to delete
+            segments of an earlier upload stored outside Firestore. Without it they are kept.
+
+    Raises:
+        Exception: The Firestore or `store_segment` error, if a segment cannot be stored.
+
+    Returns:
+        None
+    """
+    channels_ref = db.collection('ecu-data').document(main_document).collection('channels')
+    previous = channels_ref.document('manifest').get().to_dict()
+    manifest = {
+        "frequency": frequency,
+        "chunk-samples": packed_chunk_samples,
+        "encoding": packed_encoding,
+        "storage": "external" if store_segment is not None else "firestore",
+        "channels": {},
+    }
+
+    stored = set()
+    with BatchWriter(batch_size=packed_batch_size) as writer, \
+            ThreadPoolExecutor(max_workers=packed_store_workers) as pool:
+        in_flight = set()
+        for index, (name, values) in enumerate(series):
+            manifest["channels"][name] = {"index": index, "count": len(values)}
+            for part, start in enumerate(range(0, len(values), packed_chunk_samples)):
+                data = _pack_samples(values[start:start + packed_chunk_samples])
+                stored.add((index, part))
+                if store_segment is not None:
+                    # Bounded, so only a few segments' bytes are held while they upload
+                    if len(in_flight) >= 2 * packed_store_workers:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    in_flight.add(pool.submit(store_segment, packed_segment_key(main_document, index, part), data))
+                else:
+                    writer.set(channels_ref.document(f'{index:04}-{part:05}'), {
+                        "channel": name,
+                        "part": part,
+                        "data": data,
+                    })
+        for future in in_flight:
+            future.result()
+
+    channels_ref.document('manifest').set(manifest)
+    print(f"Packed channels of '{main_document}' uploaded "
+          f"({len(manifest['channels'])} channels, {len(stored)} segments).")
+
+    if previous is not None:
+        _delete_stale_segments(main_document, channels_ref, previous,
+                               stored if previous['storage'] == manifest['storage'] else set(),
+                               delete_segments)
+
+
+def _delete_stale_segments(main_document, channels_ref, previous, stored, delete_segments):
+    """
+    Deletes the segments listed by the `previous` manifest of a run that are not in `stored`.
+    """
+    chunk = previous['chunk-samples']
+    stale = [(channel['index'], part) for channel in previous['channels'].values()
+             for part in range(-(-channel['count'] // chunk))
+             if (channel['index'], part) not in stored]
+    if not stale:
+        return
+
+    if previous['storage'] == 'firestore':
+        with BatchWriter() as writer:
+            for index, part in stale:
+                writer.delete(channels_ref.document(f'{index:04}-{part:05}'))
+    elif delete_segments is not None:
+        delete_segments([packed_segment_key(main_document, index, part) for index, part in stale])
+    else:
+        return
+    print(f"Deleted {len(stale)} stale packed segments of '{main_document}'.")
+
+
+def packed_segment_key(main_document, index, part):
+    """
+    The key a packed segment is stored under outside Firestore.
+    """
+    return f'ecu-data/{main_document}/channels/{index:04}-{part:05}'
+
+
+def _pack_samples(values):
+    """
+    Compresses samples as float32, with their bytes shuffled so zlib sees runs of similar bytes.
+    """
+    values = np.ascontiguousarray(values, dtype='<f4')
+    # Level 1: shuffled samples compress within a few percent of level 6, at over 4x the speed
+    return zlib.compress(values.view(np.uint8).reshape(-1, 4).T.tobytes(), 1)
+
+
+def _unpack_samples(data, count):
+    """
+    Reverses `_pack_samples`.
+    """
+    shuffled = np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(4, count)
+    return np.ascontiguousarray(shuffled.T).view('<f4').ravel()
+
+
+def get_packed_run_data(run_title, categories_list=[], start=None, end=None, fetch_segment=None):
+    """
+    Retrieves the samples of channels of a run, as stored by `upload_packed_run_to_firestore`.
+
+    Only the segments overlapping the requested time window are read: the manifest, then
+    one read per segment.
+
+    Args:
+        run_title (str): The run document name, formatted as `YYYY-MM-DD-<title>-<freq>-hz`.
+        categories_list (list, optional): The channels to return; all channels if empty.
+        start (float, optional): The start of the window in seconds from the start of the run.
+        end (float, optional): The end of the window in seconds; the end of the run if omitted.
+        fetch_segment (callable, optional): Returns the bytes stored under a segment key, for
+            runs whose segments were stored outside Firestore.
+
+    Returns:
+        dict: The sample rate in Hz, the time of the first sample in seconds and a float32
+              NumPy array per channel:
+              {"frequency": 100, "start": 0.0, "channels": {"Speed": array([...])}}
+        None: If an error occurs during the operation.
+
+    Raises:
+        RunNotFound: If the run has no packed data (no manifest).
+    """
+    try:
+        channels_ref = db.collection('ecu-data').document(run_title).collection('channels')
+        manifest = channels_ref.document('manifest').get().to_dict()
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling packed run data: {e}")
+        return None
+    if manifest is None:
+        raise RunNotFound(f"Run {run_title} has no packed data")
+
+    try:
+        if manifest['encoding'] != packed_encoding:
+            raise ValueError(f"Unknown encoding {manifest['encoding']}")
+        if manifest['storage'] != 'firestore' and fetch_segment is None:
+            raise ValueError(f"Segments of {run_title} are stored outside Firestore")
+
+        frequency = manifest['frequency']
+        chunk = manifest['chunk-samples']
+        first = max(0, math.floor((start or 0) * frequency))
+
+        # (name, first part, samples to keep) per channel, and the segments that holds them
+        wanted, segments = [], []
+        for name in (categories_list or manifest['channels']):
+            channel = manifest['channels'].get(name)
+            if channel is None:
+                continue
+            last = channel['count'] if end is None else min(channel['count'], math.ceil(end * frequency))
+            if last <= first:
+                wanted.append((name, 0, slice(0, 0)))
+                continue
+            first_part = first // chunk
+            parts = range(first_part, (last - 1) // chunk + 1)
+            wanted.append((name, first_part, slice(first - first_part * chunk, last - first_part * chunk)))
+            for part in parts:
+                count = min(chunk, channel['count'] - part * chunk)
+                segments.append((name, part, channel['index'], count))
+
+        if manifest['storage'] == 'firestore':
+            refs = [channels_ref.document(f'{index:04}-{part:05}') for _, part, index, _ in segments]
+            blobs = {(doc.get('channel'), doc.get('part')): doc.get('data') for doc in db.get_all(refs)}
+            data = [blobs[(name, part)] for name, part, _, _ in segments]
+        else:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                data = list(pool.map(
+                    lambda segment: fetch_segment(packed_segment_key(run_title, segment[2], segment[1])),
+                    segments))
+
+        parts = {}
+        for (name, _, _, count), blob in zip(segments, data):
+            parts.setdefault(name, []).append(_unpack_samples(blob, count))
+
+        channels = {}
+        for name, _, keep in wanted:
+            samples = np.concatenate(parts[name]) if name in parts else np.empty(0, dtype='<f4')
+            channels[name] = samples[keep]
+
+        return {"frequency": frequency, "start": first / frequency, "channels": channels}
+
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling packed run data: {e}")
+        return None
+
+
 def upload_csv_columns_as_documents(csv_file_path):
     """
     Uploads data from a CSV file to Firestore where each column in the CSV is a document, and each
@@ -201,75 +781,116 @@ def upload_csv_columns_as_documents(csv_file_path):
         print(f"An error occurred while uploading CSV to Firestore: {e}")
 
 
-def get_specific_run_data(run_title, categories_list=[]):
+def get_run_key_points(run_title):
+    """
+    Retrieves the key point statistics stored on a run document at ingestion.
+
+    Returns:
+        dict: The statistics keyed by label; empty for runs ingested before they were computed.
+        None: If an error occurs during the operation.
+    """
     try:
-        # Access the 'ecu-data' collection and the 'sample_test' document
-        document_query = db.collection('ecu-data')\
-            .document(run_title)\
-            .collection('data')
-                    
-        if len(categories_list) > 0:
-            categories_formatted = [f'`{c}`' for c in categories_list]
-            document_query = document_query.select(categories_formatted)
+        snapshot = db.collection('ecu-data').document(run_title).get(['`key-points`'])
+        return (snapshot.to_dict() or {}).get('key-points', {})
 
-        # Stream all documents in the 'data' sub-collection
-        document_data = document_query.stream()
-        
-        data_list = []
-        for doc in document_data:
-            # Append the document data along with the document ID
-            doc_data = doc.to_dict()
-            doc_data['id'] = doc.id  # Include the document ID if needed
-            data_list.append(doc_data)
-                
-        return data_list
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling run key points: {e}")
+        return None
+
+
+def get_specific_run_data(run_title, categories_list=[]):
+    try:
+        return list(stream_specific_run_data(run_title, categories_list))
 
     except Exception as e:
         print(f"An unexpected error occurred when pulling specific document data: {e}")
         return None 
 
 
+def stream_specific_run_data(run_title, categories_list=[]):
+    """
+    Yields the per-second documents of a run one at a time, as they arrive from Firestore.
+
+    Unlike `get_specific_run_data`, nothing is collected, so a caller can serialize each
+    document and let it go before the next one arrives. Errors are raised to the caller.
+
+    Args:
+        run_title (str): The run document name, formatted as `YYYY-MM-DD-<title>-<freq>-hz`.
+        categories_list (list, optional): Only include these fields of each document.
+
+    Yields:
+        dict: The document's fields plus its ID under 'id'.
+    """
+    # Access the 'ecu-data' collection and the 'sample_test' document
+    document_query = db.collection('ecu-data')\
+        .document(run_title)\
+        .collection('data')
+
+    if len(categories_list) > 0:
+        categories_formatted = [f'`{c}`' for c in categories_list]
+        document_query = document_query.select(categories_formatted)
+
+    # Stream all documents in the 'data' sub-collection
+    for doc in document_query.stream():
+        # Append the document data along with the document ID
+        doc_data = doc.to_dict()
+        doc_data['id'] = doc.id  # Include the document ID if needed
+        yield doc_data
+
+
 def get_specific_run_data_paginated(run_title, page_size, start_after_doc="", end_before_doc="", categories_list=[]):
+    """
+    Retrieves one page of the per-second documents of a run, in document ID order.
+
+    The page is positioned on the document ID itself, so no read of the neighbouring
+    document is needed to build the cursor. One document more than the page is fetched to
+    tell whether another page follows in that direction.
+
+    Args:
+        run_title (str): The run document name, formatted as `YYYY-MM-DD-<title>-<freq>-hz`.
+        page_size (int): The number of documents per page.
+        start_after_doc (str, optional): Return the page after this document ID.
+        end_before_doc (str, optional): Return the page before this document ID, if
+            `start_after_doc` is not given. The first page is returned if neither is.
+        categories_list (list, optional): Only include these fields of each document.
+
+    Returns:
+        dict: {"documents": [...], "hasNext": bool, "hasPrevious": bool}, each document being
+              its fields plus its ID under 'id'.
+        None: If an error occurs during the operation.
+    """
     try:
+        page_size = int(page_size)
         document_query = db.collection('ecu-data')\
             .document(run_title)\
             .collection('data')
-        
+
         if len(categories_list) > 0:
             categories_formatted = [f'`{c}`' for c in categories_list]
             document_query = document_query.select(categories_formatted)
 
-        if len(start_after_doc) > 0:
-            previous_doc_snapshot = db.collection('ecu-data')\
-                .document(run_title)\
-                .collection('data')\
-                .document(start_after_doc)\
-                .get()
-
-            document_query = document_query.start_after(previous_doc_snapshot)
-
-        elif len(end_before_doc) > 0:
-            last_doc_snapshot = db.collection('ecu-data')\
-                .document(run_title)\
-                .collection('data')\
-                .document(end_before_doc)\
-                .get()
-
-            document_query = document_query.end_before(last_doc_snapshot)
-
+        document_query = document_query.order_by('__name__')
 
-        document_data = document_query\
-            .order_by('__name__')\
-            .limit(int(page_size)).stream()
+        if len(start_after_doc) == 0 and len(end_before_doc) > 0:
+            # limit_to_last queries cannot be streamed
+            docs = document_query.end_before({'__name__': end_before_doc})\
+                .limit_to_last(page_size + 1).get()
+            has_previous, has_next = len(docs) > page_size, True
+            docs = docs[-page_size:] if page_size > 0 else []
+        else:
+            if len(start_after_doc) > 0:
+                document_query = document_query.start_after({'__name__': start_after_doc})
+            docs = list(document_query.limit(page_size + 1).stream())
+            has_previous, has_next = len(start_after_doc) > 0, len(docs) > page_size
+            docs = docs[:page_size]
 
         data_list = []
-        for doc in document_data:
-            # Append the document data along with the document ID
+        for doc in docs:
             doc_data = doc.to_dict()
-            doc_data['id'] = doc.id  # Include the document ID if needed
+            doc_data['id'] = doc.id
             data_list.append(doc_data)
-                
-        return data_list
+
+        return {"documents": data_list, "hasNext": has_next, "hasPrevious": has_previous}
     except Exception as e:
         print(f"An unexpected error occurred when pulling specific document data (paginated): {e}")
         return None
@@ -0,0 +1,408 @@
+"""
+firestore_async.py
+
+Async counterparts of the read and issue functions in firestore.py, built on Firestore's
+AsyncClient so that async views can await them directly. Wrapping the blocking functions in
+`sync_to_async` runs them one at a time on a single thread, so concurrent requests queue
+behind each other; awaiting the async client lets them overlap on an event loop.
+
+gRPC's asyncio channels belong to the event loop they were created on, and Django serves
+async views over WSGI on a new event loop per request. So that every request shares one
+client and one channel, the client lives on its own long-lived loop in a background thread,
+and each function here runs there, whichever loop it is awaited from.
+
+Each function returns what its counterpart in firestore.py returns, and handles errors the
+same way. Ingestion and other writes of run data stay in firestore.py.
+"""
+import asyncio
+import functools
+import threading
+from .firebase import firebase_app
+from .firestore import merge_summary_documents
+from firebase_admin import firestore
+
+_loop = None
+_loop_lock = threading.Lock()
+_client = None
+_END = object()
+
+
+def _client_loop():
+    """
+    Returns the event loop the client runs on, starting its thread on first use.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='firestore-async', daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def _run_on_client_loop(coro):
+    return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _client_loop()))
+
+
+def _on_client_loop(func):
+    """
+    Runs a coroutine function on the client's loop, awaiting its result from the caller's loop.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await _run_on_client_loop(func(*args, **kwargs))
+    return wrapper
+
+
+async def _anext(agen):
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _END
+
+
+def _iter_on_client_loop(func):
+    """
+    Runs an async generator function on the client's loop, yielding its items on the caller's loop.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        agen = func(*args, **kwargs)
+        try:
+            while (item := await _run_on_client_loop(_anext(agen))) is not _END:
+                yield item
+        finally:
+            await _run_on_client_loop(agen.aclose())
+    return wrapper
+
+
+def client():
+    """
+    Returns the shared AsyncClient, creating it on first use. Only call this on the client's
+    loop, i.e. from a function wrapped by `_on_client_loop` or `_iter_on_client_loop`.
+    """
+    global _client
+    if _client is None:
+        _client = firestore.AsyncClient(credentials=firebase_app.credential.get_credential(),
+                                        project=firebase_app.project_id)
+    return _client
+
+
+@_on_client_loop
+async def add_driver(data):
+    """
+    Adds a driver document to the 'driver-profiles' collection, unless one with the same
+    first and last name already exists. See `firestore.add_driver`.
+    """
+    try:
+        if not isinstance(data, dict):
+            raise ValueError("Input must be a dictionary.")
+
+        if not data:
+            raise ValueError("Input dictionary cannot be empty.")
+
+        main_db = client().collection('driver-profiles')
+        existing_driver_query = main_db.where('firstName', '==', data['firstName'])\
+            .where('lastName', '==', data['lastName'])\
+            .limit(1)
+        driver_exists = False
+        async for _ in existing_driver_query.stream():
+            driver_exists = True
+        if not driver_exists:
+            await main_db.add(data)
+            print(f"Driver profile for {data['firstName']} {data['lastName']} added.")
+        else:
+            print(f"Driver profile for {data['firstName']} {data['lastName']} already exists.")
+
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+        return None
+
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return None
+
+
+@_on_client_loop
+async def get_all_drivers(filters=None):
+    """
+    Retrieves all drivers from the 'driver-profiles' collection with optional filtering.
+    See `firestore.get_all_drivers`.
+    """
+    try:
+        query = client().collection('driver-profiles')
+
+        if filters:
+            for key, value in filters.items():
+                if value is not None:
+                    query = query.where(key, '==', value)
+
+        drivers = []
+        async for doc in query.stream():
+            driver_data = doc.to_dict()
+            driver_data['driverId'] = doc.id
+            drivers.append(driver_data)
+
+        return drivers
+
+    except Exception as e:
+        print(f"An error occurred while retrieving users: {e}")
+        return []
+
+
+@_on_client_loop
+async def get_general_run_data(filter_limit=10, filtered_date=None, filtered_driver=None):
+    """
+    Retrieves the `filter_limit` most recent runs' general data. See `firestore.get_general_run_data`.
+    """
+    try:
+        filtered_docs_query = client().collection('ecu-data')\
+            .order_by('`run-date`', direction=firestore.Query.DESCENDING)\
+            .limit(filter_limit)
+
+        data_list = []
+        async for doc in filtered_docs_query.stream():
+            doc_data = doc.to_dict()
+            doc_data['id'] = doc.id
+            data_list.append(doc_data)
+
+        return data_list
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return None
+
+
+@_iter_on_client_loop
+async def stream_specific_run_data(run_title, categories_list=[]):
+    """
+    Yields the per-second documents of a run one at a time, as they arrive from Firestore.
+    Errors are raised to the caller. See `firestore.stream_specific_run_data`.
+    """
+    document_query = client().collection('ecu-data')\
+        .document(run_title)\
+        .collection('data')
+
+    if len(categories_list) > 0:
+        categories_formatted = [f'`{c}`' for c in categories_list]
+        document_query = document_query.select(categories_formatted)
+
+    async for doc in document_query.stream():
+        doc_data = doc.to_dict()
+        doc_data['id'] = doc.id
+        yield doc_data
+
+
+@_on_client_loop
+async def get_run_key_points(run_title):
+    """
+    Retrieves the key point statistics stored on a run document. See `firestore.get_run_key_points`.
+    """
+    try:
+        snapshot = await client().collection('ecu-data').document(run_title).get(['`key-points`'])
+        return (snapshot.to_dict() or {}).get('key-points', {})
+
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling run key points: {e}")
+        return None
+
+
+@_on_client_loop
+async def get_specific_run_data(run_title, categories_list=[]):
+    try:
+        # Already on the client's loop, so stream directly rather than hopping per document
+        return [doc async for doc in stream_specific_run_data.__wrapped__(run_title, categories_list)]
+
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling specific document data: {e}")
+        return None
+
+
+@_on_client_loop
+async def get_specific_run_data_paginated(run_title, page_size, start_after_doc="", end_before_doc="", categories_list=[]):
+    """
+    Retrieves one page of the per-second documents of a run, in document ID order.
+    See `firestore.get_specific_run_data_paginated`.
+    """
+    try:
+        page_size = int(page_size)
+        document_query = client().collection('ecu-data')\
+            .document(run_title)\
+            .collection('data')
+
+        if len(categories_list) > 0:
+            categories_formatted = [f'`{c}`' for c in categories_list]
+            document_query = document_query.select(categories_formatted)
+
+        document_query = document_query.order_by('__name__')
+
+        if len(start_after_doc) == 0 and len(end_before_doc) > 0:
+            # limit_to_last queries cannot be streamed
+            docs = await document_query.end_before({'__name__': end_before_doc})\
+                .limit_to_last(page_size + 1).get()
+            has_previous, has_next = len(docs) > page_size, True
+            docs = docs[-page_size:] if page_size > 0 else []
+        else:
+            if len(start_after_doc) > 0:
+                document_query = document_query.start_after({'__name__': start_after_doc})
+            docs = [doc async for doc in document_query.limit(page_size + 1).stream()]
+            has_previous, has_next = len(start_after_doc) > 0, len(docs) > page_size
+            docs = docs[:page_size]
+
+        data_list = []
+        for doc in docs:
+            doc_data = doc.to_dict()
+            doc_data['id'] = doc.id
+            data_list.append(doc_data)
+
+        return {"documents": data_list, "hasNext": has_next, "hasPrevious": has_previous}
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling specific document data (paginated): {e}")
+        return None
+
+
+@_on_client_loop
+async def get_run_summary(run_title, resolution=None, categories_list=[]):
+    """
+    Retrieves the min/max/mean rollups of a run. See `firestore.get_run_summary`.
+    """
+    try:
+        query = client().collection('ecu-data').document(run_title).collection('summary')
+        if resolution is not None:
+            query = query.where('resolution', '==', int(resolution))
+        if len(categories_list) > 0:
+            query = query.select(['resolution', 'start'] + [f'channels.`{c}`' for c in categories_list])
+
+        return merge_summary_documents([doc.to_dict() async for doc in query.stream()])
+
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling run summary data: {e}")
+        return None
+
+
+@_on_client_loop
+async def add_issue(data):
+    try:
+        if not isinstance(data, dict):
+            raise ValueError("Input must be a dictionary.")
+
+        required_fields = ['driver', 'date', 'synopsis', 'subsystems', 'description']
+        for field in required_fields:
+            if field not in data or not data[field]:
+                raise ValueError(f"Missing or empty required field: {field}")
+
+        issue_data = {
+            'driver': data['driver'],
+            'date': data['date'],
+            'synopsis': data['synopsis'],
+            'subsystems': data['subsystems'],
+            'description': data['description'],
+            'priority': data.get('priority', 'Medium'),
+            'status': data.get('status', 'Open'),
+            'created_at': firestore.SERVER_TIMESTAMP
+        }
+
+        doc_ref = client().collection('issues').document()
+        await doc_ref.set(issue_data)
+
+        print(f"Issue '{data['synopsis']}' added with ID: {doc_ref.id}")
+        return {"issue_id": doc_ref.id}
+
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+        return None
+
+    except Exception as e:
+        print(f"An unexpected error occurred while adding issue: {e}")
+        return None
+
+
+@_on_client_loop
+async def get_all_issues(filters=None):
+    """
+    Retrieves all issues, most recent first, with optional filtering. See `firestore.get_all_issues`.
+    """
+    try:
+        query = client().collection('issues').order_by('created_at', direction=firestore.Query.DESCENDING)
+
+        if filters:
+            for field in ('driver', 'priority', 'status'):
+                if filters.get(field):
+                    query = query.where(field, '==', filters[field])
+
+        issues = []
+        async for doc in query.stream():
+            issue_data = doc.to_dict()
+            issue_data['id'] = doc.id
+
+            if filters and filters.get('subsystem'):
+                if filters['subsystem'] in issue_data['subsystems']:
+                    issues.append(issue_data)
+            else:
+                issues.append(issue_data)
+
+        return issues
+
+    except Exception as e:
+        print(f"An error occurred while retrieving issues: {e}")
+        return None
+
+
+@_on_client_loop
+async def update_issue(issue_id: str, data: dict):
+    try:
+        if not isinstance(data, dict):
+            raise ValueError("Input must be a dictionary.")
+        if not issue_id:
+            raise ValueError("Issue ID must be provided.")
+
+        issue_data = {
+            'driver': data.get('driver'),
+            'date': data.get('date'),
+            'synopsis': data.get('synopsis'),
+            'subsystems': data.get('subsystems'),
+            'description': data.get('description'),
+            'priority': data.get('priority'),
+            'status': data.get('status'),
+            'updated_at': firestore.SERVER_TIMESTAMP
+        }
+        issue_data = {k: v for k, v in issue_data.items() if v is not None}
+
+        doc_ref = client().collection('issues').document(issue_id)
+
+        if not (await doc_ref.get()).exists:
+            raise ValueError(f"Issue with ID {issue_id} not found.")
+
+        await doc_ref.update(issue_data)
+        print(f"Issue {issue_id} updated successfully")
+        return {"issue_id": issue_id}
+
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred while updating issue: {e}")
+        return None
+
+
+@_on_client_loop
+async def delete_issue(issue_id: str):
+    try:
+        if not issue_id:
+            raise ValueError("Issue ID must be provided.")
+
+        doc_ref = client().collection('issues').document(issue_id)
+
+        if not (await doc_ref.get()).exists:
+            print(f"Issue with ID {issue_id} not found.")
+            return None
+
+        await doc_ref.delete()
+        print(f"Issue {issue_id} deleted successfully")
+        return {"issue_id": issue_id}
+
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred while deleting issue: {e}")
+        return None
@@ -0,0 +1,154 @@
+"""
+jobs.py
+
+Background ingestion of uploaded LD files. The upload endpoint persists the file and
+records an `IngestionJob` in the database; a bounded pool of worker threads then parses
+the file and uploads it to Firestore, recording status and progress on the job as it goes.
+
+Each server process resumes the queue as it starts (see fsae_backend/wsgi.py): jobs left
+running by a process that has since stopped, e.g. on a restart, are queued again, and every
+queued job is submitted.
+"""
+import os
+import shutil
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+from .models import IngestionJob
+from .ld_parser.main import process_and_upload_ld_file, save_uploaded_ld_file
+
+_executor = ThreadPoolExecutor(max_workers=settings.INGESTION_WORKERS, thread_name_prefix='ingestion')
+
+
+def enqueue_ld_file(data_file, run_date, run_title, driver_id):
+    """
+    Persist an uploaded LD file and queue it for background processing.
+
+    Args:
+        data_file: The uploaded file (e.g. Django UploadedFile).
+        run_date (str): The ISO formatted date of the run.
+        run_title (str): The title of the run.
+        driver_id (str): The ID of the driver of the run.
+
+    Raises:
+        ValueError: If the file is not an LD file.
+
+    Returns:
+        IngestionJob: The queued job.
+    """
+    if not data_file.name.endswith('.ld'):
+        raise ValueError("Uploaded data file must be an .ld file.")
+
+    # The file is fully written before the job exists, so no worker can see a partial upload
+    job_dir = os.path.join(settings.INGESTION_DIR, uuid.uuid4().hex)
+    file_path = save_uploaded_ld_file(data_file, job_dir, run_date, run_title)
+
+    job = IngestionJob.objects.create(file_path=file_path, run_title=run_title,
+                                      run_date=run_date, driver_id=driver_id)
+    _executor.submit(run_job, job.id)
+    return job
+
+
+def get_job(job_id):
+    """
+    Returns:
+        IngestionJob: The job with the given ID, or None if it does not exist.
+    """
+    return IngestionJob.objects.filter(id=job_id).first()
+
+
+def get_recent_jobs(limit=20):
+    """
+    Returns:
+        list: The most recently created jobs, newest first.
+    """
+    return list(IngestionJob.objects.all()[:limit])
+
+
+def run_job(job_id):
+    """
+    Process a queued job on the current thread.
+
+    The job is claimed atomically, so a job submitted twice (e.g. by two server processes
+    resuming the queue) only runs once. The claiming process is recorded on the job, so that
+    it can be requeued if that process stops before finishing it.
+    """
+    close_old_connections()
+    try:
+        claimed = IngestionJob.objects.filter(id=job_id, status=IngestionJob.QUEUED)\
+            .update(status=IngestionJob.RUNNING, worker=_worker_id(), updated_at=timezone.now())
+        if not claimed:
+            return
+        job = IngestionJob.objects.get(id=job_id)
+
+        try:
+            process_and_upload_ld_file(job.file_path, job.driver_id,
+                                       progress=lambda fraction: _update(job_id, progress=fraction))
+        except Exception as e:
+            print(f"Ingestion job {job_id} failed: {e}")
+            _update(job_id, status=IngestionJob.FAILED, message=str(e))
+            return
+
+        _update(job_id, status=IngestionJob.SUCCEEDED, progress=1.0)
+        shutil.rmtree(os.path.dirname(job.file_path), ignore_errors=True)
+    finally:
+        close_old_connections()
+
+
+def _update(job_id, **fields):
+    # QuerySet.update skips auto_now, so stamp updated_at explicitly
+    IngestionJob.objects.filter(id=job_id).update(updated_at=timezone.now(), **fields)
+
+
+def resume_interrupted_jobs():
+    """
+    Requeue jobs whose server process stopped while running them, then submit every queued job.
+
+    Called once as each server process starts. Only processes on this host can be checked,
+    so jobs claimed on another host are left alone. If the jobs table does not exist yet
+    (migrations have not been run), nothing is resumed.
+    """
+    close_old_connections()
+    try:
+        for job_id, worker in IngestionJob.objects.filter(status=IngestionJob.RUNNING)\
+                .values_list('id', 'worker'):
+            if _worker_alive(worker):
+                continue
+            requeued = IngestionJob.objects.filter(id=job_id, status=IngestionJob.RUNNING, worker=worker)\
+                .update(status=IngestionJob.QUEUED, worker='', progress=0, updated_at=timezone.now(),
+                        message="Requeued after its server process stopped")
+            if requeued:
+                print(f"Requeued ingestion job {job_id}, interrupted while running on {worker or 'an unknown process'}")
+
+        for job_id in IngestionJob.objects.filter(status=IngestionJob.QUEUED).values_list('id', flat=True):
+            _executor.submit(run_job, job_id)
+    except DatabaseError as e:
+        print(f"Could not resume ingestion jobs: {e}")
+    finally:
+        close_old_connections()
+
+
+def _worker_id():
+    # Looked up per claim rather than at import, since servers may fork after importing
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _worker_alive(worker):
+    """
+    Whether the process recorded on a job as `host:pid` may still be running it.
+    """
+    host, _, pid = worker.rpartition(':')
+    if not pid.isdigit():
+        return False
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
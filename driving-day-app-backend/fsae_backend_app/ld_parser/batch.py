@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .cache import ldCache
+from .data_containers import ldData
+
+
+def default_workers():
+    """
+    The number of worker processes to use: one per CPU this process may run on.
+
+    Returns:
+        int: The number of usable CPUs, at least 1.
+    """
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def decode_ld_files(file_paths, cache, workers=None):
+    """
+    Parse and scale several ld files in parallel, one worker process per file at a time.
+
+    Workers write their results into `cache` rather than sending arrays back through
+    pickling; the returned objects are cache hits whose channel data is memory-mapped from
+    the entries the workers wrote. Files already in the cache are not parsed again.
+
+    Args:
+        file_paths (list of str): The ld files to decode.
+        cache (ldCache): The cache the workers store their results in.
+        workers (int, optional): The number of worker processes. Defaults to `default_workers()`.
+
+    Returns:
+        list: One ldData per path, in the same order, or None for files that could not be decoded.
+    """
+    if not file_paths:
+        return []
+    workers = min(workers or default_workers(), len(file_paths))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_decode_to_cache, f_, cache.cache_dir, cache.max_bytes)
+                   for f_ in file_paths]
+
+    results = []
+    for f_, future in zip(file_paths, futures):
+        try:
+            key = future.result()
+        except Exception as e:
+            print(f"Could not decode {f_}: {e}")
+            results.append(None)
+            continue
+
+        ld = cache.load(key)
+        if ld is None:
+            # Evicted again before it could be read back; decode it here instead
+            ld = ldData.fromfile(f_, use_mmap=True)
+        results.append(ld)
+    return results
+
+
+def _decode_to_cache(f_, cache_dir, max_bytes):
+    """
+    Worker entry point: parse one ld file into the cache and return its cache key.
+    """
+    cache = ldCache(cache_dir, max_bytes)
+    key = cache.fingerprint(f_)
+    if key not in cache:
+        with ldData.fromfile(f_, use_mmap=True) as ld:
+            cache.store(key, ld)
+    return key
@@ -0,0 +1,322 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+from unittest import mock
+from django.test import override_settings
+from .data_containers import ldData
+from .file_utils import map_ldfile, read_ldfile
+from .synthetic import write_ld_file
+
+# Default size of the synthetic log: a 10 minute session of a full car logger
+DEFAULT_CHANNS = 200
+DEFAULT_DURATION = 600
+# Channels in the wider log `ldData.load_all` is benchmarked on, serially and threaded
+LOAD_ALL_CHANNS = 500
+
+
+class StubFirestore(object):
+    """In-memory stand-in for a Firestore client that only counts the writes it receives.
+
+    Supports the calls the upload pipeline makes: `collection().document()` chains, `set`
+    and `get` (of a document that does not exist) on a document, and `batch()` with
+    `set`/`delete`/`commit`.
+    """
+
+    def __init__(self):
+        self.writes = 0
+
+    def collection(self, name):
+        return _StubRef(self)
+
+    def batch(self):
+        return _StubBatch(self)
+
+
+class _StubRef(object):
+    def __init__(self, client):
+        self.client = client
+
+    def collection(self, name):
+        return self
+
+    def document(self, name):
+        return self
+
+    def set(self, data):
+        self.client.writes += 1
+
+    def get(self, field_paths=None):
+        return _StubSnapshot()
+
+
+class _StubSnapshot(object):
+    exists = False
+
+    def to_dict(self):
+        return None
+
+
+class _StubBatch(object):
+    def __init__(self, client):
+        self.client = client
+        self.ops = 0
+
+    def set(self, doc_ref, data):
+        self.ops += 1
+
+    def delete(self, doc_ref):
+        self.ops += 1
+
+    def commit(self):
+        self.client.writes += self.ops
+
+
+def measure(func, setup=None, rounds=5):
+    """
+    Time `func` over several rounds, then run it once more under tracemalloc.
+
+    Memory is measured in a separate round so tracing does not slow down the timed ones.
+
+    Args:
+        func (callable): Called with the result of `setup`, or with no arguments.
+        setup (callable, optional): Called before every round, outside the timing.
+        rounds (int): The number of timed rounds.
+
+    Returns:
+        dict: The min, median and mean time in seconds, and the peak traced memory in bytes.
+    """
+    def run_once(traced):
+        state = setup() if setup is not None else None
+        args = () if setup is None else (state,)
+        if traced:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            func(*args)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if traced else None
+        finally:
+            if traced:
+                tracemalloc.stop()
+        return elapsed, peak
+
+    times = [run_once(traced=False)[0] for _ in range(rounds)]
+    _, peak = run_once(traced=True)
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.mean(times),
+        'peak_bytes': peak,
+    }
+
+
+def _unfused_scale(chann, raw):
+    """
+    Scale raw samples as `ldChan` did before its factors were folded into gain and offset,
+    one full-size temporary per operation, for comparison with `ldChan._scale`.
+    """
+    return ((raw / chann.scale * pow(10., -chann.dec) + chann.shift) * chann.mul).astype(chann.data_dtype)
+
+
+def _import_pipeline(client):
+    """
+    Import the upload pipeline with `client` in place of Firestore.
+
+    Firebase credentials are not needed: if the app has not already been initialized, the
+    module that builds it from the environment is replaced before anything imports it.
+    """
+    app_module = 'fsae_backend_app.firebase.firebase'
+    if app_module not in sys.modules:
+        stub = types.ModuleType(app_module)
+        stub.firebase_app = None
+        sys.modules[app_module] = stub
+    with mock.patch('firebase_admin.firestore.client', return_value=client):
+        from . import main
+        from ..firebase import firestore
+    return main, firestore
+
+
+def benchmark_cases(file_path, workdir, num_channs=DEFAULT_CHANNS, duration=DEFAULT_DURATION):
+    """
+    The parser benchmarks, run against the ld file at `file_path`.
+
+    Args:
+        file_path (str): A (synthetic) ld file.
+        workdir (str): Scratch space for cases that write files.
+        num_channs, duration (int): The size of the file, for cases that write a variant of it.
+
+    Returns:
+        list of tuple: (name, func, setup) for each case.
+    """
+    def fresh():
+        return ldData.fromfile(file_path)
+
+    def load_data(ld):
+        for chann in ld.channs:
+            chann.data
+
+    # Scaling is compared on a tenth of the channels with a shift, the costlier path, logged
+    # at 1 kHz so that each spans many of `_scale`'s blocks
+    shifted_path = os.path.join(workdir, 'shifted.ld')
+
+    def raw_channels():
+        if not os.path.exists(shifted_path):
+            write_ld_file(shifted_path, num_channs=max(1, num_channs // 10), duration=duration,
+                          rates=(1000,), dtypes=('int16', 'int32'), shift=5)
+        ld = ldData.fromfile(shifted_path)
+        return [(chann, chann.raw) for chann in ld.channs if chann.dtype is not None]
+
+    def scale_fused(channels):
+        for chann, raw in channels:
+            chann._scale(raw)
+
+    def scale_unfused(channels):
+        for chann, raw in channels:
+            _unfused_scale(chann, raw)
+
+    def read_mapped():
+        with contextlib.closing(map_ldfile(file_path)) as mm:
+            read_ldfile(mm)
+
+    def pipeline_setup():
+        data_dir = os.path.join(workdir, 'pipeline')
+        shutil.rmtree(data_dir, ignore_errors=True)
+        os.makedirs(data_dir)
+        shutil.copy(file_path, os.path.join(data_dir, '2024-11-23-benchmark.ld'))
+        return data_dir
+
+    def pipeline(data_dir):
+        client = StubFirestore()
+        main, firestore = _import_pipeline(client)
+        with mock.patch.object(firestore, 'db', client), \
+                override_settings(DATA_DIR=data_dir, LD_CACHE_DIR=os.path.join(data_dir, 'cache'),
+                                  LD_CSV_EXPORT_DIR=None, LD_SEGMENT_STORAGE='firestore'), \
+                contextlib.redirect_stdout(io.StringIO()):
+            main.process_and_upload_ld_files('benchmark-driver')
+        # Files are only removed once uploaded; a failed upload would otherwise just look fast
+        if os.path.exists(os.path.join(data_dir, '2024-11-23-benchmark.ld')):
+            raise RuntimeError("The pipeline failed to upload the benchmark file")
+
+    return [
+        ('read_ldfile', lambda: read_ldfile(file_path), None),
+        ('read_ldfile_mmap', read_mapped, None),
+        ('chann_data', load_data, fresh),
+        ('scale_fused', scale_fused, raw_channels),
+        ('scale_unfused', scale_unfused, raw_channels),
+        ('to_dataframe', lambda ld: ld.to_dataframe(), fresh),
+        ('process_and_upload_ld_files', pipeline, pipeline_setup),
+    ]
+
+
+def load_all_cases(file_path):
+    """
+    The `ldData.load_all` benchmarks, decoding every channel of the ld file at `file_path`
+    serially and on a thread pool.
+
+    Returns:
+        list of tuple: (name, func, setup) for each case.
+    """
+    def fresh():
+        return ldData.fromfile(file_path)
+
+    return [
+        ('load_all_serial', lambda ld: ld.load_all(workers=1), fresh),
+        ('load_all_threaded', lambda ld: ld.load_all(), fresh),
+    ]
+
+
+def run_benchmarks(workdir, num_channs=DEFAULT_CHANNS, duration=DEFAULT_DURATION, rounds=5, only=None):
+    """
+    Generate synthetic ld files in `workdir` and run the parser benchmarks against them.
+
+    The `load_all` cases run on a file of `LOAD_ALL_CHANNS` channels rather than `num_channs`.
+
+    Args:
+        workdir (str): Scratch directory for the generated file and pipeline runs.
+        num_channs (int): The number of channels in the generated file.
+        duration (int): The length of the generated log in seconds.
+        rounds (int): Timed rounds per case.
+        only (list of str, optional): Run only the cases with these names.
+
+    Returns:
+        dict: Results keyed by case name, as returned by `measure` plus the file parameters.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    file_path = write_ld_file(os.path.join(workdir, f'synthetic-{num_channs}-{duration}.ld'),
+                              num_channs=num_channs, duration=duration)
+    params = {'channels': num_channs, 'duration': duration}
+
+    results = {}
+    for name, func, setup in benchmark_cases(file_path, workdir, num_channs, duration):
+        if only and name not in only:
+            continue
+        results[name] = dict(measure(func, setup, rounds), **params)
+
+    wide_path = os.path.join(workdir, f'synthetic-{LOAD_ALL_CHANNS}-{duration}.ld')
+    wide_params = {'channels': LOAD_ALL_CHANNS, 'duration': duration}
+    for name, func, setup in load_all_cases(wide_path):
+        if only and name not in only:
+            continue
+        if not os.path.exists(wide_path):
+            write_ld_file(wide_path, num_channs=LOAD_ALL_CHANNS, duration=duration)
+        results[name] = dict(measure(func, setup, rounds), **wide_params)
+    return results
+
+
+def load_baselines(path):
+    """
+    Read stored benchmark results, or an empty dict if there are none yet.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(path, results):
+    """
+    Store benchmark results as the baselines later runs are compared against.
+
+    Cases not in `results` keep their existing baselines.
+    """
+    baselines = load_baselines(path)
+    baselines.update(results)
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results, baselines, tolerance=0.25):
+    """
+    Find cases that are slower, or use more memory, than their baselines allow.
+
+    Cases are only compared with a baseline recorded for the same file size; medians are
+    compared for time.
+
+    Args:
+        results (dict): Results from `run_benchmarks`.
+        baselines (dict): Results from `load_baselines`.
+        tolerance (float): The allowed fractional increase, e.g. 0.25 for 25%.
+
+    Returns:
+        list of str: One description per regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None or (baseline['channels'], baseline['duration']) != \
+                (result['channels'], result['duration']):
+            continue
+        for key, label in (('median', 'median time'), ('peak_bytes', 'peak memory')):
+            if baseline.get(key) and result[key] > baseline[key] * (1 + tolerance):
+                regressions.append(f"{name}: {label} {result[key]:.4g} vs baseline {baseline[key]:.4g} "
+                                   f"(+{result[key] / baseline[key] - 1:.0%})")
+    return regressions
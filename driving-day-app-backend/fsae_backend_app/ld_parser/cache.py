@@ -0,0 +1,250 @@
+import datetime
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import uuid
+import zipfile
+import numpy as np
+from .data_containers import ldChan, ldData, ldEvent, ldHead, ldVenue
+
+
+class ldCache(object):
+    """On-disk cache of parsed ld files, keyed by a hash of the file contents.
+
+    Each entry is an uncompressed .npz archive holding the header and channel metadata
+    as JSON plus one scaled array per channel. Entries are memory-mapped when loaded, so
+    channel data is only paged in as it is used. Entries are evicted least recently used
+    first once the cache grows past `max_bytes`.
+    """
+
+    # Bump when the entry layout or the scaling of stored data changes so stale entries
+    # are never read back (2: scaling rounded once, from float64; 3: shifts cancel exactly)
+    version = 3
+
+    def __init__(self, cache_dir, max_bytes=2 * 1024 ** 3):
+        """
+        Initialize an ldCache rooted at `cache_dir`.
+
+        Args:
+            cache_dir (str): The directory entries are stored in. Created if missing.
+            max_bytes (int): The total size the cache is trimmed back to after each store.
+        """
+        self.cache_dir = str(cache_dir)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def fingerprint(self, f_):
+        """
+        Hash the contents of an ld file.
+
+        Args:
+            f_ (str): The file path of the ld file.
+
+        Returns:
+            str: A hex digest identifying the file contents and cache layout.
+        """
+        # SHA-256 has CPU instructions on modern x86/ARM, making it faster than blake2b there
+        h = hashlib.sha256(f'ldCache-v{self.version}'.encode('ascii'))
+        with open(f_, 'rb') as f:
+            for block in iter(lambda: f.read(4 * 1024 * 1024), b''):
+                h.update(block)
+        return h.hexdigest()[:32]
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.npz')
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def load(self, key):
+        """
+        Read a cached ldData back, marking the entry as recently used.
+
+        Args:
+            key (str): A fingerprint returned by `fingerprint`.
+
+        Returns:
+            ldData: The cached file. Channel data is available as read-only views over a
+                mapping of the entry, released by `ldData.close`.
+            None: If there is no usable entry for `key`.
+        """
+        path = self._path(key)
+        try:
+            mm, meta, arrays = self._map_entry(path)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        head = self._head_from_dict(meta['head'])
+        channs = []
+        for n, fields in enumerate(meta['channs']):
+            dtype = np.dtype(fields['dtype']).type if fields['dtype'] else None
+            chann = ldChan(None, fields['meta_ptr'], fields['prev_meta_ptr'], fields['next_meta_ptr'],
+                           fields['data_ptr'], fields['data_len'], dtype, fields['freq'],
+                           fields['shift'], fields['mul'], fields['scale'], fields['dec'],
+                           fields['name'], fields['short_name'], fields['unit'])
+            chann._data = arrays.get(f'chann_{n}')
+            channs.append(chann)
+        return ldData(head, channs, mm=mm)
+
+    @staticmethod
+    def _map_entry(path):
+        """
+        Map a cache entry and view each stored array in place.
+
+        Entries are written without compression, so every .npy member is a contiguous
+        run of bytes that can be wrapped with `np.frombuffer`.
+
+        Args:
+            path (str): The path of the .npz entry.
+
+        Returns:
+            tuple: The mapping, the decoded metadata dict, and a dict of array views
+                keyed by member name without the .npy suffix.
+        """
+        with zipfile.ZipFile(path) as archive:
+            infos = archive.infolist()
+            with archive.open('meta.npy') as f:
+                meta = json.loads(str(np.lib.format.read_array(f, allow_pickle=False)))
+
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        arrays = {}
+        for info in infos:
+            name = os.path.splitext(info.filename)[0]
+            if name == 'meta':
+                continue
+            # Local file header: 30 fixed bytes, then the file name and extra field
+            name_len, extra_len = struct.unpack_from('<HH', mm, info.header_offset + 26)
+            start = info.header_offset + 30 + name_len + extra_len
+            header = io.BytesIO(mm[start:start + min(info.file_size, 4096)])
+            version = np.lib.format.read_magic(header)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(header)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(header)
+            arrays[name] = np.frombuffer(mm, dtype=dtype, count=int(np.prod(shape)),
+                                         offset=start + header.tell())
+        return mm, meta, arrays
+
+    def store(self, key, ld):
+        """
+        Write an ldData to the cache and evict old entries if it is over size.
+
+        Channels are scaled and written one at a time, so storing a memory-mapped file
+        does not require holding all of its data in memory at once.
+
+        Args:
+            key (str): A fingerprint returned by `fingerprint`.
+            ld (ldData): The parsed file to store.
+        """
+        path = self._path(key)
+        # Unique per writer, so concurrent stores of the same file never share a temp file
+        tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        meta = {'head': self._head_to_dict(ld.head), 'channs': []}
+        try:
+            with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+                for n, chann in enumerate(ld.channs):
+                    meta['channs'].append(self._chann_to_dict(chann))
+                    chann_data = self._chann_data(chann)
+                    if chann_data is None:
+                        continue
+                    with archive.open(f'chann_{n}.npy', 'w', force_zip64=True) as f:
+                        np.lib.format.write_array(f, chann_data, allow_pickle=False)
+                with archive.open('meta.npy', 'w') as f:
+                    np.lib.format.write_array(f, np.array(json.dumps(meta)), allow_pickle=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Failed to write cache entry {path}: {e}")
+            self._remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits in `max_bytes`.
+        """
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.npz'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, filename))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filename))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, filename in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(self.cache_dir, filename))
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _chann_data(chann):
+        """Scaled data of a channel, without caching it on the channel if it is not loaded."""
+        try:
+            return chann.read()
+        except ValueError as v:
+            print(v, chann.name, chann.freq, hex(chann.data_ptr), hex(chann.data_len))
+            return None
+
+    @staticmethod
+    def _chann_to_dict(chann):
+        return {
+            'meta_ptr': chann.meta_ptr, 'prev_meta_ptr': chann.prev_meta_ptr,
+            'next_meta_ptr': chann.next_meta_ptr, 'data_ptr': chann.data_ptr,
+            'data_len': chann.data_len,
+            'dtype': np.dtype(chann.dtype).str if chann.dtype is not None else None,
+            'freq': chann.freq, 'shift': chann.shift, 'mul': chann.mul,
+            'scale': chann.scale, 'dec': chann.dec,
+            'name': chann.name, 'short_name': chann.short_name, 'unit': chann.unit,
+        }
+
+    @staticmethod
+    def _head_to_dict(head):
+        event = None
+        if head.event is not None:
+            venue = None
+            if head.event.venue is not None:
+                venue = {'name': head.event.venue.name, 'vehicle_ptr': head.event.venue.vehicle_ptr}
+            event = {'name': head.event.name, 'session': head.event.session,
+                     'comment': head.event.comment, 'venue_ptr': head.event.venue_ptr,
+                     'venue': venue}
+        return {
+            'meta_ptr': head.meta_ptr, 'data_ptr': head.data_ptr, 'event_ptr': head.event_ptr,
+            'event': event, 'driver': head.driver, 'vehicleid': head.vehicleid,
+            'venue': head.venue, 'datetime': head.datetime.isoformat(),
+            'short_comment': head.short_comment, 'num_channs': head.num_channs,
+        }
+
+    @staticmethod
+    def _head_from_dict(fields):
+        event = None
+        if fields['event'] is not None:
+            venue = None
+            if fields['event']['venue'] is not None:
+                venue = ldVenue(fields['event']['venue']['name'],
+                                fields['event']['venue']['vehicle_ptr'], None)
+            event = ldEvent(fields['event']['name'], fields['event']['session'],
+                            fields['event']['comment'], fields['event']['venue_ptr'], venue)
+        return ldHead(fields['meta_ptr'], fields['data_ptr'], fields['event_ptr'], event,
+                      fields['driver'], fields['vehicleid'], fields['venue'],
+                      datetime.datetime.fromisoformat(fields['datetime']),
+                      fields['short_comment'], num_channs=fields['num_channs'])
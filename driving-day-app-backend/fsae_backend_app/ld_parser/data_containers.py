@@ -1,44 +1,122 @@
 import datetime
+import mmap
 import struct
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
-from .file_utils import decode_string, read_channels, read_ldfile
+from .file_utils import decode_string, map_ldfile, read_channels, read_ldfile
+
+# Samples scaled per pass when a channel has an offset: 512 KiB of float64 scratch
+SCALE_BLOCK = 65536
 
 
 class ldData(object):
     """Class to represent and manage ld file data including header and channels."""
     
-    def __init__(self, head, channs):
+    def __init__(self, head, channs, mm=None):
         """
         Initialize ldData object with header and channels.
 
         Args:
             head: The header data for the ld file.
             channs: A list of channel data for the ld file.
+            mm (mmap.mmap, optional): The mapping the channels were parsed from, if any.
+                It is owned by this object and released by `close`.
         """
         self.head = head
         self.channs = channs
+        self._mm = mm
+
+        # Name lookups are O(1); names shared by several channels are ambiguous
+        self._names = tuple(x.name for x in channs)
+        self._name_index, self._ambiguous = self._build_index(self._names)
+        self._short_name_index, self._ambiguous_short = self._build_index(
+            x.short_name for x in channs)
+
+    @staticmethod
+    def _build_index(names):
+        """
+        Map each name to its channel index, collecting names that occur more than once.
+
+        Args:
+            names (iterable of str): Channel names in channel order.
+
+        Returns:
+            tuple: The name to index dict and the set of duplicated names.
+        """
+        index, duplicates = {}, set()
+        for n, name in enumerate(names):
+            if name in index:
+                duplicates.add(name)
+            index.setdefault(name, n)
+        return index, duplicates
+
+    def close(self):
+        """
+        Release the memory mapping backing this object, if there is one.
+
+        Channel data that was already loaded stays available. Raw views returned by
+        `ldChan.raw` must be dropped before closing, otherwise the mapping is left for
+        the garbage collector to release.
+        """
+        if self._mm is None:
+            return
+        for chann in self.channs:
+            chann._f = None
+        try:
+            self._mm.close()
+        except BufferError:
+            # Raw views are still exported; the mapping is freed once they are collected
+            pass
+        self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def __getitem__(self, item):
         """
         Retrieve channel data by index or name.
 
+        Names are matched against the full channel name first, then the short name.
+
         Args:
             item (int or str): The index or name of the channel.
 
         Raises:
-            Exception: If the channel is not found by the provided name.
+            Exception: If the channel is not found by the provided name, or the name
+                       is shared by several channels.
 
         Returns:
             Channel data corresponding to the provided index or name.
         """
         if not isinstance(item, int):
-            col = [n for n, x in enumerate(self.channs) if x.name == item]
-            if len(col) != 1:
-                raise Exception("Could get column", item, col)
-            item = col[0]
+            item = self._index_of(item)
         return self.channs[item]
 
+    def _index_of(self, name):
+        """
+        Look up the channel index for a full or short channel name.
+
+        Args:
+            name (str): The full name or short name of the channel.
+
+        Raises:
+            Exception: If no channel, or more than one channel, has that name.
+
+        Returns:
+            int: The index of the channel in `channs`.
+        """
+        if name in self._name_index:
+            if name in self._ambiguous:
+                raise Exception("Could get column", name, "name is not unique")
+            return self._name_index[name]
+        if name in self._short_name_index and name not in self._ambiguous_short:
+            return self._short_name_index[name]
+        raise Exception("Could get column", name, [])
+
     def __iter__(self):
         """
         Iterator over the channel names.
@@ -46,47 +124,248 @@ class ldData(object):
         Returns:
             Iterator: An iterator over the names of the channels.
         """
-        return iter([x.name for x in self.channs])
+        return iter(self._names)
 
-    def to_dataframe(self):
+    def select(self, names):
         """
-        Convert ldData to a pandas DataFrame.
+        Retrieve several channels by name in one call, with their data loaded.
+
+        Channel data is read in file-offset order so disk access stays sequential,
+        regardless of the order the names are requested in.
+
+        Args:
+            names (list of str): Full or short names of the channels to retrieve.
+
+        Raises:
+            Exception: If any of the names does not identify exactly one channel.
 
         Returns:
-            DataFrame: A pandas DataFrame containing the channel data.
+            list: The requested `ldChan` objects, in the order the names were given.
         """
-        data_dict = {}
-        lengths = {}
-        
+        channs = [self.channs[self._index_of(name)] for name in names]
+        for chann in sorted(channs, key=lambda x: x.data_ptr):
+            if chann.dtype is not None:
+                chann.data
+        return channs
+
+    def load_all(self, workers=None):
+        """
+        Read and scale the data of every channel, decoding channels concurrently.
+
+        Reading and scaling release the GIL, so channels are decoded on a thread pool.
+        Channels are submitted in `data_ptr` order to keep file access close to sequential.
+
+        Args:
+            workers (int, optional): The number of threads. 1 decodes serially on the calling
+                thread; None uses the ThreadPoolExecutor default.
+
+        Returns:
+            ldData: This object, with every readable channel's data loaded.
+        """
+        channs = sorted((x for x in self.channs if x.dtype is not None and x._data is None),
+                        key=lambda x: x.data_ptr)
+        if workers == 1:
+            for chann in channs:
+                chann.data
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for _ in pool.map(lambda x: x.data, channs):
+                    pass
+        return self
+
+    def iter_chunks(self, names, rows=65536, dtype=None):
+        """
+        Stream several channels recorded at the same frequency as time-aligned blocks.
+
+        Channels are read and scaled `rows` samples at a time without caching their data,
+        so a whole run can be processed with bounded memory. Channels that recorded fewer
+        samples than the others are NaN-padded at the end.
+
+        Args:
+            names (list of str or ldChan): The channels to stream, by full or short name or
+                as channel objects from this file.
+            rows (int): The maximum number of rows per block.
+            dtype (np.dtype, optional): The dtype of the blocks. Defaults to the smallest
+                float dtype that holds every channel's `data_dtype`.
+
+        Raises:
+            ValueError: If the channels do not share a single recording frequency.
+
+        Yields:
+            tuple: A float array of sample times in seconds with shape (k,), and the
+                processed samples with shape (k, len(names)), one column per channel.
+        """
+        channs = [x if isinstance(x, ldChan) else self[x] for x in names]
+        freqs = {x.freq for x in channs}
+        if len(freqs) != 1:
+            raise ValueError(f"Channels must share one recording frequency, got {sorted(freqs)}")
+        freq = freqs.pop()
+
+        length = max(x.data_len for x in channs)
+        # One dtype for every block, even once shorter channels have run out
+        chunk_dtype = np.dtype(dtype) if dtype is not None else \
+            np.result_type(np.float16, *(x.data_dtype for x in channs))
+        chunk_iters = [x.iter_chunks(rows, dtype) for x in channs]
+        for start in range(0, length, rows):
+            chunks = [next(chunk_iter, None) for chunk_iter in chunk_iters]
+            k = min(rows, length - start)
+            block = np.full((k, len(channs)), np.nan, dtype=chunk_dtype)
+            for n, chunk in enumerate(chunks):
+                if chunk is not None:
+                    block[:len(chunk), n] = chunk
+            yield self._time_index(freq, k, start).to_numpy(), block
+
+    def group_by_freq(self):
+        """
+        Group the channels by their recording frequency.
+
+        Only channel metadata is used; no channel data is read.
+
+        Returns:
+            dict: Maps a frequency in Hz to the list of `ldChan` objects recorded at it.
+        """
+        groups = {}
         for chann in self.channs:
-            try:
-                chann_data = chann.data
-                if chann_data is not None:
-                    data_dict[chann.name] = chann_data.tolist() if isinstance(chann_data, np.ndarray) else chann_data
-                    lengths[chann.name] = len(data_dict[chann.name])
-            except Exception as e:
-                print(f"Error parsing {chann.name}: {e}")
-        
-        # Group data by unique lengths
+            groups.setdefault(chann.freq, []).append(chann)
+        return groups
+
+    @staticmethod
+    def _time_index(freq, length, start=0):
+        """
+        Build the float time index, in seconds, for samples recorded at `freq`.
+
+        Args:
+            freq (int): The recording frequency in Hz.
+            length (int): The number of samples.
+            start (int): The sample number of the first sample.
+
+        Returns:
+            pd.Index: Sample times in seconds, or a plain RangeIndex if `freq` is not positive.
+        """
+        if freq <= 0:
+            return pd.RangeIndex(start, start + length, name='time')
+        return pd.Index(np.arange(start, start + length, dtype=np.float64) / freq, name='time')
+
+    def to_dataframe(self):
+        """
+        Convert ldData to pandas DataFrames, one per recording frequency.
+
+        Channel arrays are handed to pandas as columns without copying them through
+        Python lists, so each column keeps the dtype of its channel data. Every frame is
+        indexed by the shared sample time of its group in seconds. Channels that recorded
+        fewer samples than the rest of their group are padded with NaN at the end.
+
+        Returns:
+            dict: Maps a frequency in Hz to a DataFrame holding every channel recorded at it.
+        """
         grouped_data = {}
-        for key, value in data_dict.items():
-            grouped_data.setdefault(len(value), {})[key] = value
-        
-        # Create DataFrames for each unique length
-        return {length: pd.DataFrame(group) for length, group in grouped_data.items()}
+
+        for freq, channs in self.group_by_freq().items():
+            group = {}
+            for chann in channs:
+                try:
+                    chann_data = chann.data
+                    if chann_data is not None:
+                        group[chann.name] = chann_data
+                except Exception as e:
+                    print(f"Error parsing {chann.name}: {e}")
+            if group:
+                grouped_data[freq] = group
+
+        # Create DataFrames for each frequency, padding channels that dropped samples
+        dataframes = {}
+        for freq, group in grouped_data.items():
+            length = max(len(x) for x in group.values())
+            for name, chann_data in group.items():
+                if len(chann_data) < length:
+                    padded = np.full(length, np.nan, dtype=np.result_type(chann_data.dtype, np.float16))
+                    padded[:len(chann_data)] = chann_data
+                    group[name] = padded
+            dataframes[freq] = pd.DataFrame(group, index=self._time_index(freq, length), copy=False)
+        return dataframes
+
+    def resample_to(self, hz):
+        """
+        Align every channel onto a single timebase sampled at `hz`.
+
+        Each sample time is mapped to a fractional position in the source channel and
+        the channel is linearly interpolated there. When a channel's frequency is a
+        multiple of `hz` the positions are whole numbers, so this reduces to picking
+        every n-th sample. Times past the end of a channel are NaN.
+
+        Args:
+            hz (float): The target sampling frequency in Hz.
+
+        Raises:
+            ValueError: If `hz` is not positive.
+
+        Returns:
+            DataFrame: One column per channel, indexed by time in seconds.
+        """
+        if hz <= 0:
+            raise ValueError(f"Cannot resample to {hz} Hz")
+
+        dataframes = {freq: df for freq, df in self.to_dataframe().items() if freq > 0}
+        if not dataframes:
+            return pd.DataFrame(index=self._time_index(hz, 0))
+
+        duration = max(len(df) / freq for freq, df in dataframes.items())
+        time = np.arange(int(np.floor(duration * hz)), dtype=np.float64)
+
+        columns = {}
+        for freq, df in dataframes.items():
+            pos = time * freq / hz
+            lo = np.floor(pos).astype(np.intp)
+            frac = pos - lo
+            past_end = pos > len(df) - 1
+            lo = np.minimum(lo, len(df) - 1)
+            hi = np.minimum(lo + 1, len(df) - 1)
+            for name in df.columns:
+                values = df[name].to_numpy()
+                resampled = values[lo] + (values[hi] - values[lo]) * frac.astype(values.dtype)
+                resampled[past_end] = np.nan
+                columns[name] = resampled
+        return pd.DataFrame(columns, index=self._time_index(hz, len(time)), copy=False)
 
     @classmethod
-    def fromfile(cls, f):
+    def fromfile(cls, f, use_mmap=False, cache=None):
         """
         Create an ldData object from a file.
 
         Args:
             f: A file object representing the ld file.
+            use_mmap (bool): If True, map the file once and parse the header, channel
+                metadata and channel samples from that single mapping instead of
+                reopening the file for every channel. Call `close` (or use the object
+                as a context manager) when done.
+            cache (ldCache, optional): A parse cache. Files whose contents were parsed
+                before are returned from it with all channel data loaded; others are
+                parsed, stored in it, and returned from the stored entry, so their channels
+                are not scaled a second time.
 
         Returns:
             ldData: An ldData object initialized with data from the file.
         """
-        return cls(*read_ldfile(f))
+        if cache is not None:
+            key = cache.fingerprint(f)
+            cached = cache.load(key)
+            if cached is not None:
+                return cached
+
+        if use_mmap:
+            mm = map_ldfile(f)
+            ld = cls(*read_ldfile(mm), mm=mm)
+        else:
+            ld = cls(*read_ldfile(f))
+
+        if cache is not None:
+            cache.store(key, ld)
+            # The entry was just written, so it is read back from the page cache
+            stored = cache.load(key)
+            if stored is not None:
+                ld.close()
+                return stored
+        return ld
 
 
 class ldEvent(object):
@@ -200,7 +479,8 @@ class ldHead(object):
         "126x"    # ??
     )
 
-    def __init__(self, meta_ptr, data_ptr, event_ptr, event, driver, vehicleid, venue, datetime, short_comment):
+    def __init__(self, meta_ptr, data_ptr, event_ptr, event, driver, vehicleid, venue, datetime, short_comment,
+                 num_channs=None):
         """
         Initialize ldHead object.
 
@@ -214,10 +494,12 @@ class ldHead(object):
             venue (str): The venue information.
             datetime (datetime): The datetime of the log.
             short_comment (str): A short comment associated with the log.
+            num_channs (int, optional): The number of channels declared by the header.
         """
         self.meta_ptr, self.data_ptr, self.event_ptr, self.event, self.driver, self.vehicleid, \
             self.venue, self.datetime, self.short_comment = meta_ptr, data_ptr, event_ptr, event, \
             driver, vehicleid, venue, datetime, short_comment
+        self.num_channs = num_channs
 
     @classmethod
     def fromfile(cls, f):
@@ -252,7 +534,8 @@ class ldHead(object):
         if event_ptr > 0:
             f.seek(event_ptr)
             event = ldEvent.fromfile(f)
-        return cls(meta_ptr, data_ptr, event_ptr, event, driver, vehicleid, venue, _datetime, short_comment)
+        return cls(meta_ptr, data_ptr, event_ptr, event, driver, vehicleid, venue, _datetime, short_comment,
+                   num_channs=n)
 
 class ldChan(object):
     """Class to represent a channel within an ld file, storing meta and data information.
@@ -273,13 +556,31 @@ class ldChan(object):
         "40x"     # reserved bytes (40 for ACC, 32 for acti)
     )
 
+    # NumPy record layout of `fmt`, used to decode a whole metadata block in one call
+    meta_dtype = np.dtype({
+        'names': ['prev_addr', 'next_addr', 'data_ptr', 'n_data',
+                  'counter',
+                  'dtype_a', 'dtype', 'freq',
+                  'shift', 'mul', 'scale', 'dec',
+                  'name', 'short_name', 'unit'],
+        'formats': ['<u4', '<u4', '<u4', '<u4',
+                    '<u2',
+                    '<u2', '<u2', '<u2',
+                    '<i2', '<i2', '<i2', '<i2',
+                    'S32', 'S8', 'S12'],
+        'itemsize': struct.calcsize(fmt),
+    })
+
+    # The dtype scaled channel data is produced in; set on an instance to override
+    data_dtype = np.float32
+
     def __init__(self, _f, meta_ptr, prev_meta_ptr, next_meta_ptr, data_ptr, data_len,
                  dtype, freq, shift, mul, scale, dec, name, short_name, unit):
         """
         Initialize an ldChan object with the given metadata.
 
         Args:
-            _f (str): The filename of the ld file to read from.
+            _f (str or mmap.mmap): The filename of the ld file to read from, or a mapping of it.
             meta_ptr (int): Pointer to the channel's metadata within the ld file.
             prev_meta_ptr (int): Pointer to the previous channel's metadata (if any).
             next_meta_ptr (int): Pointer to the next channel's metadata (if any).
@@ -307,25 +608,51 @@ class ldChan(object):
             name, short_name, unit
         )
 
+        # (raw / scale * 10^-dec + shift) * mul folded into raw * gain + offset; with an offset
+        # it is applied as (raw * step + shift) * mul, so that a shift cancels exactly
+        self.step = pow(10., -dec) / scale if scale else np.inf
+        self.gain = mul * self.step
+        self.offset = float(shift * mul)
+
     @classmethod
     def fromfile(cls, _f, meta_ptr):
         """
         Parse and create an ldChan object from the ld file.
 
         Args:
-            _f (str): The filename of the ld file to read from.
+            _f (str or mmap.mmap): The filename of the ld file to read from, or a mapping of it.
             meta_ptr (int): Pointer to the channel's metadata in the ld file.
 
         Returns:
             ldChan: An initialized ldChan object with the parsed metadata.
         """
-        with open(_f, 'rb') as f:
-            f.seek(meta_ptr)
-            (prev_meta_ptr, next_meta_ptr, data_ptr, data_len, _,
-             dtype_a, dtype, freq, shift, mul, scale, dec,
-             name, short_name, unit) = struct.unpack(
-                ldChan.fmt, f.read(struct.calcsize(ldChan.fmt))
-            )
+        if isinstance(_f, mmap.mmap):
+            fields = struct.unpack_from(ldChan.fmt, _f, meta_ptr)
+        else:
+            with open(_f, 'rb') as f:
+                f.seek(meta_ptr)
+                fields = struct.unpack(
+                    ldChan.fmt, f.read(struct.calcsize(ldChan.fmt))
+                )
+
+        return cls.fromfields(_f, meta_ptr, fields)
+
+    @classmethod
+    def fromfields(cls, _f, meta_ptr, fields):
+        """
+        Create an ldChan object from an already unpacked metadata record.
+
+        Args:
+            _f (str or mmap.mmap): The filename of the ld file to read from, or a mapping of it.
+            meta_ptr (int): Pointer to the channel's metadata in the ld file.
+            fields (tuple): The values of one record laid out as in `ldChan.fmt`.
+
+        Returns:
+            ldChan: An initialized ldChan object with the parsed metadata.
+        """
+        (prev_meta_ptr, next_meta_ptr, data_ptr, data_len, _,
+         dtype_a, dtype, freq, shift, mul, scale, dec,
+         name, short_name, unit) = fields
 
         name, short_name, unit = map(decode_string, [name, short_name, unit])
 
@@ -345,13 +672,48 @@ class ldChan(object):
         return cls(_f, meta_ptr, prev_meta_ptr, next_meta_ptr, data_ptr, data_len,
                    dtype, freq, shift, mul, scale, dec, name, short_name, unit)
 
+    @property
+    def raw(self):
+        """
+        Retrieve the unscaled channel samples as stored in the ld file.
+
+        For channels parsed from a memory mapping this is a zero-copy, read-only view
+        over the mapping; otherwise the samples are read from the file.
+
+        Raises:
+            ValueError: If the channel's data type is unknown or if not all data points
+                        could be read.
+
+        Returns:
+            np.array: The raw data points of the channel.
+        """
+        if self.dtype is None:
+            raise ValueError(f'Channel {self.name} has unknown data type')
+        if self._f is None:
+            raise ValueError(f'Channel {self.name} belongs to a closed ld file')
+
+        if isinstance(self._f, mmap.mmap):
+            end = self.data_ptr + self.data_len * np.dtype(self.dtype).itemsize
+            if end > len(self._f):
+                raise ValueError("Not all data read!")
+            return np.frombuffer(self._f, dtype=self.dtype,
+                                 count=self.data_len, offset=self.data_ptr)
+
+        with open(self._f, 'rb') as f:
+            f.seek(self.data_ptr)
+            raw = np.fromfile(f, count=self.data_len, dtype=self.dtype)
+        if len(raw) != self.data_len:
+            raise ValueError("Not all data read!")
+        return raw
+
     @property
     def data(self):
         """
         Retrieve the channel data as a numpy array.
 
         This property reads the data from the ld file on demand, applies scaling,
-        shifting, and multiplication factors, and returns the processed data.
+        shifting, and multiplication factors, and returns the processed data in
+        `data_dtype`.
 
         Raises:
             ValueError: If the channel's data type is unknown or if not all data points
@@ -364,24 +726,123 @@ class ldChan(object):
             raise ValueError(f'Channel {self.name} has unknown data type')
 
         if self._data is None:
-            # Jump to the data section and read the channel's data
-            with open(self._f, 'rb') as f:
-                f.seek(self.data_ptr)
-                try:
-                    self._data = np.fromfile(
-                        f, count=self.data_len, dtype=self.dtype
-                    )
+            try:
+                # Read the channel's samples (a zero-copy view when memory-mapped)
+                raw = self.raw
+
+                # Apply scaling, shifting, and multiplication
+                self._data = self._scale(raw)
+
+            except ValueError as v:
+                print(v, self.name, self.freq,
+                      hex(self.data_ptr), hex(self.data_len))
+
+        return self._data
+
+    def read(self):
+        """
+        Read and scale the channel data without caching it on the channel.
+
+        Lets callers work through a file one channel at a time without every channel staying
+        in memory. Data that is already loaded is returned as is.
+
+        Raises:
+            ValueError: If the channel's data type is unknown or if not all data points
+                        are successfully read.
+
+        Returns:
+            np.array: The processed data points of the channel.
+        """
+        if self._data is not None:
+            return self._data
+        return self._scale(self.raw)
+
+    def _scale(self, raw, dtype=None):
+        """
+        Apply the channel's scaling, shifting, and multiplication factors to raw samples.
 
-                    # Apply scaling, shifting, and multiplication
-                    self._data = (self._data / self.scale *
-                                  pow(10., -self.dec) + self.shift) * self.mul
+        The factors are precomputed into `gain` and `offset`, which are applied in place
+        to a single preallocated output array. The arithmetic is done in float64 and only
+        the result is rounded to the output dtype, so decimal-scaled integer samples match
+        the unfolded formula (e.g. 104 with one decimal place is 10.4, not 10.400001).
+        With an offset, samples are scaled as `(raw * step + shift) * mul` instead, so that
+        values the shift should cancel come out as exactly zero; for a narrower output each
+        `SCALE_BLOCK` samples go through one reused float64 scratch buffer, so no temporary
+        grows with the channel.
 
-                    if len(self._data) != self.data_len:
-                        raise ValueError("Not all data read!")
+        Args:
+            raw (np.array): Unscaled samples as stored in the ld file.
+            dtype (np.dtype, optional): The output dtype. Defaults to `data_dtype`.
+
+        Returns:
+            np.array: The processed samples.
+        """
+        out = np.empty(len(raw), dtype=dtype or self.data_dtype)
+        if not self.offset:
+            # NumPy casts from float64 to `out` through its own small buffers
+            np.multiply(raw, self.gain, out=out, dtype=np.float64, casting='same_kind')
+        elif out.dtype == np.float64:
+            self._shift_scale(raw, out)
+        else:
+            scratch = np.empty(min(len(raw), SCALE_BLOCK), dtype=np.float64)
+            for start in range(0, len(raw), SCALE_BLOCK):
+                block = scratch[:min(SCALE_BLOCK, len(raw) - start)]
+                out[start:start + len(block)] = self._shift_scale(raw[start:start + SCALE_BLOCK], block)
+        return out
+
+    def _shift_scale(self, raw, out):
+        """
+        Scale `raw` into the float64 array `out` in place, as `(raw * step + shift) * mul`.
+        """
+        np.multiply(raw, self.step, out=out)
+        np.add(out, self.shift, out=out)
+        np.multiply(out, self.mul, out=out)
+        return out
+
+    def iter_chunks(self, rows=65536, dtype=None):
+        """
+        Iterate over the channel data in blocks of at most `rows` samples.
+
+        Each block is read and scaled on its own and nothing is cached on the channel,
+        so memory use is bounded by the block size however long the log is. Channels
+        whose data is already loaded are sliced instead.
 
-                except ValueError as v:
-                    print(v, self.name, self.freq,
-                          hex(self.data_ptr), hex(self.data_len),
-                          hex(len(self._data)), hex(f.tell()))
+        Args:
+            rows (int): The maximum number of samples per block.
+            dtype (np.dtype, optional): The dtype of the blocks. Defaults to `data_dtype`.
+
+        Raises:
+            ValueError: If the channel's data type is unknown or its file has been closed.
+
+        Yields:
+            np.array: Consecutive blocks of processed data points.
+        """
+        if self.dtype is None:
+            raise ValueError(f'Channel {self.name} has unknown data type')
 
-        return self._data
\ No newline at end of file
+        if self._data is not None:
+            # Already loaded (or restored from a cache); slice it instead of rereading
+            for start in range(0, len(self._data), rows):
+                yield self._data[start:start + rows].astype(dtype or self._data.dtype, copy=False)
+            return
+
+        if self._f is None:
+            raise ValueError(f'Channel {self.name} belongs to a closed ld file')
+
+        if isinstance(self._f, mmap.mmap):
+            raw = self.raw
+            for start in range(0, len(raw), rows):
+                yield self._scale(raw[start:start + rows], dtype)
+            return
+
+        with open(self._f, 'rb') as f:
+            f.seek(self.data_ptr)
+            remaining = self.data_len
+            while remaining > 0:
+                raw = np.fromfile(f, count=min(rows, remaining), dtype=self.dtype)
+                if len(raw) == 0:
+                    print("Not all data read!", self.name, self.freq,
+                          hex(self.data_ptr), hex(self.data_len))
+                    return
+                remaining -= len(raw)
+                yield self._scale(raw, dtype)
\ No newline at end of file
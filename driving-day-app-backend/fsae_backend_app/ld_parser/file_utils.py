@@ -1,3 +1,7 @@
+import mmap
+import numpy as np
+
+
 def decode_string(bytes):
     """
     Decodes a byte string to a clean ASCII string.
@@ -19,13 +23,63 @@ def decode_string(bytes):
         return ""
 
 
-def read_channels(f_, meta_ptr):
+def read_channel_block(f_, meta_ptr, num_channs):
+    """
+    Decodes the channel metadata block in a single read, if it is contiguous.
+
+    MoTeC loggers usually write the channel linked list as one packed array of
+    `ldChan.fmt` records. This reads `num_channs` records starting at `meta_ptr` into a
+    NumPy structured array (`ldChan.meta_dtype`) and checks that every record's next
+    pointer refers to the record directly after it.
+
+    Args:
+        f_ (str or mmap.mmap): The file path of the ld file to read from, or a mapping
+            of it returned by `map_ldfile`.
+        meta_ptr (int): The pointer to the start of the channel metadata block.
+        num_channs (int): The number of channels declared by the header.
+
+    Returns:
+        np.ndarray: A structured array with one record per channel, in list order.
+        None: If the block is empty, truncated, or not laid out contiguously.
+    """
+    from .data_containers import ldChan  # Import inside function to avoid circular import issues
+    if not meta_ptr or not num_channs:
+        return None
+
+    meta_dtype = ldChan.meta_dtype
+    size = num_channs * meta_dtype.itemsize
+    if isinstance(f_, mmap.mmap):
+        block = f_[meta_ptr:meta_ptr + size]
+    else:
+        with open(f_, 'rb') as f:
+            f.seek(meta_ptr)
+            block = f.read(size)
+    if len(block) != size:
+        return None
+
+    meta = np.frombuffer(block, dtype=meta_dtype, count=num_channs)
+
+    # The chain must walk the block in order and terminate at its last record
+    expected_next = meta_ptr + meta_dtype.itemsize * np.arange(1, num_channs + 1, dtype=np.int64)
+    expected_next[-1] = 0
+    if not np.array_equal(meta['next_addr'], expected_next):
+        return None
+    return meta
+
+
+def read_channels(f_, meta_ptr, num_channs=None):
     """
     Reads and parses all channel data from the file starting from a given metadata pointer.
 
+    When the header's channel count is known and the metadata records are stored
+    contiguously, the whole block is decoded at once with `read_channel_block`.
+    Otherwise the linked list is walked one record at a time.
+
     Args:
-        f_ (str): The file path of the ld file to read from.
+        f_ (str or mmap.mmap): The file path of the ld file to read from, or a mapping
+            of it returned by `map_ldfile`.
         meta_ptr (int): The pointer to the start of the channel metadata block.
+        num_channs (int, optional): The number of channels declared by the header.
 
     Returns:
         list: A list of `ldChan` objects representing the channels in the file.
@@ -33,21 +87,44 @@ def read_channels(f_, meta_ptr):
     Raises:
         ImportError: If the `ldChan` class cannot be imported from the `data_containers` module.
     """    
+    from .data_containers import ldChan  # Import inside function to avoid circular import issues
+    meta = read_channel_block(f_, meta_ptr, num_channs)
+    if meta is not None:
+        itemsize = ldChan.meta_dtype.itemsize
+        return [ldChan.fromfields(f_, meta_ptr + n * itemsize, fields)
+                for n, fields in enumerate(meta.tolist())]
+
     chans = []
     while meta_ptr:
-        from .data_containers import ldChan  # Import inside function to avoid circular import issues
         chan_ = ldChan.fromfile(f_, meta_ptr)  # Parse a single channel
         chans.append(chan_)
         meta_ptr = chan_.next_meta_ptr  # Move to the next channel's metadata
     return chans
 
 
+def map_ldfile(f_):
+    """
+    Memory-maps an ld file read-only so it can be parsed without reopening it.
+
+    Args:
+        f_ (str): The file path of the ld file to map.
+
+    Returns:
+        mmap.mmap: A read-only mapping of the whole file. The file descriptor is closed
+            immediately; the mapping stays valid until it is closed.
+    """
+    with open(f_, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 def read_ldfile(f_):
     """
     Reads the contents of an ld file and extracts its header and channel data.
 
     Args:
-        f_ (str): The file path of the ld file to read.
+        f_ (str or mmap.mmap): The file path of the ld file to read, or a mapping of it
+            returned by `map_ldfile`. When a mapping is given, the header, channel
+            metadata and channel samples are all read from it without reopening the file.
 
     Returns:
         tuple: A tuple containing:
@@ -59,6 +136,11 @@ def read_ldfile(f_):
         FileNotFoundError: If the specified file path is invalid.
     """    
     from .data_containers import ldHead  # Import inside function to avoid circular import issues
-    head_ = ldHead.fromfile(open(f_, 'rb'))  # Parse the header
-    chans = read_channels(f_, head_.meta_ptr)  # Read the channels using the header metadata pointer
+    if isinstance(f_, mmap.mmap):
+        f_.seek(0)
+        head_ = ldHead.fromfile(f_)  # Parse the header straight from the mapping
+    else:
+        with open(f_, 'rb') as f:
+            head_ = ldHead.fromfile(f)  # Parse the header
+    chans = read_channels(f_, head_.meta_ptr, head_.num_channs)  # Read the channels using the header metadata pointer
     return head_, chans
\ No newline at end of file
@@ -1,82 +1,149 @@
+import io
 import os
-import math
+import pandas as pd
 from django.conf import settings
 from .data_containers import ldData
-from ..firebase.firestore import upload_csv_to_firestore
+from .cache import ldCache
+from .batch import decode_ld_files
+from .summary import compute_key_points, compute_rollups
+from ..run_cache import invalidate_run
+from ..firebase.firestore import upload_packed_run_to_firestore, upload_run_summary_to_firestore, upload_run_to_firestore
 from ..firebase.firebase import firebase_app
 from firebase_admin import firestore
-from django.core.files.storage import default_storage
 from datetime import datetime
 
 
 db = firestore.client()
 
-def process_and_upload_inputted_ld_file(data_file, run_date, run_title, driver_id):
+def ld_file_name(run_date, run_title):
     '''
-        Process LD file that is inputted by the user
+        Name an uploaded LD file after its run, as `YYYY-MM-DD-<run title>.ld`
+    '''
+    run_date = datetime.fromisoformat(run_date)
+    return f'{run_date:%Y-%m-%d}-{run_title}.ld'
+
+
+def save_uploaded_ld_file(data_file, directory, run_date, run_title):
+    '''
+        Write an uploaded LD file into `directory` under its run name, returning its path
+    '''
+    os.makedirs(directory, exist_ok=True)
+    file_path = os.path.join(directory, ld_file_name(run_date, run_title))
+    with open(file_path, "wb") as destination_file:
+        for chunk in data_file.chunks():
+            destination_file.write(chunk)
+    return file_path
+
+
+def process_and_upload_ld_files(driver_id):
+    '''
+        Process LD (Logical Data) files in the data directory and upload each rate group to Firestore.
+
+    Each file is deleted once it has been uploaded. Files that fail are left in place, and files
+    added while this runs are left for the next run.
     '''
     data_path = settings.DATA_DIR
+    os.makedirs(data_path, exist_ok=True)
+    file_paths = [os.path.join(data_path, filename) for filename in os.listdir(data_path)
+                  if filename.endswith('.ld')]
+
+    # Decode every file in parallel up front; the uploads below are then served from the cache.
+    # A single file gains nothing from the cache, so it is read straight from disk
+    cache = None
+    if len(file_paths) > 1:
+        cache = ldCache(settings.LD_CACHE_DIR, settings.LD_CACHE_MAX_BYTES)
+        for ld in decode_ld_files(file_paths, cache):
+            if ld is not None:
+                ld.close()
+
+    for file_path in file_paths:
+        print(os.path.basename(file_path))
+        try:
+            process_and_upload_ld_file(file_path, driver_id, cache=cache)
+        except Exception as e:
+            print(f"Failed to process {file_path}: {e}")
+            continue
+
+        try:
+            os.remove(file_path)
+            print(f"Deleted {file_path}")
+        except Exception as e:
+            print(f"Failed to delete {file_path}: {e}")
+
+
+def process_and_upload_ld_file(file_path, driver_id, progress=None, cache=None):
+    '''
+        Process a single LD file, named `YYYY-MM-DD-<run title>.ld`, and upload each rate group to Firestore.
 
-    if data_file.name.endswith('.ld'):
-        file_content = data_file.read()
-        run_date = datetime.fromisoformat(run_date)
+        `progress` is called with the fraction of rate groups uploaded so far. Errors are raised to the caller.
 
-        year = str(run_date.year)
-        month = str(run_date.month) if run_date.month > 10 else "0" + str(run_date.month)
-        day = str(run_date.day) if run_date.day > 10 else "0" + str(run_date.day)
+        `cache`, an ldCache, is only used when given, by the batch workflows that decode files up front or
+        re-ingest them; a one-off upload is read straight from its file rather than copied into the cache first.
+    '''
+    filename = os.path.basename(file_path)
+
+    # Parsing LD (mapped once, streamed in blocks so the run is never held in memory)
+    # Files already decoded by a batch workflow are served from the parse cache
+    with ldData.fromfile(file_path, use_mmap=True, cache=cache) as l:
+        groups = list(l.group_by_freq().items())
+        # Computed over every channel of the run, and stored on each rate group's document
+        key_points = compute_key_points([c for c in l.channs if c.dtype is not None], settings.RUN_KEY_POINTS)
+        for n, (freq, channs) in enumerate(groups):
+            channs = [c for c in channs if c.dtype is not None]
+            if freq <= 0 or not channs:
+                print(f"Skipping {len(channs)} channels recorded at {freq} Hz")
+                continue
+            run_name = os.path.splitext(filename)[0] + '-' + str(freq) + '-hz'
+            columns = [c.name for c in channs]
 
+            if settings.LD_CSV_EXPORT_DIR:
+                export_csv(l, channs, os.path.join(settings.LD_CSV_EXPORT_DIR, run_name + '.csv'))
 
-        file_path = os.path.join(data_path, f'{year}-{month}-{day}-{run_title}.ld')
-        
-        # Change to account for uploaded metadata
-        with default_storage.open(file_path, "wb+") as destination_file:
-            destination_file.write(file_content)
-        
-        # await asyncio.to_thread()
-        process_and_upload_ld_files(driver_id)
+            # Uploading typed rows straight from the rate group to Firebase
+            blocks = (block for _, block in l.iter_chunks(channs))
+            upload_run_to_firestore(run_name, columns, blocks, freq, driver_id, key_points)
+            print(f"Data from {run_name} uploaded to Firestore")
 
+            # Overview charts read these few documents instead of every row
+            upload_run_summary_to_firestore(run_name, columns, compute_rollups(channs, freq))
+            # Every sample, channel-major, for reading a few channels of a whole run
+            upload_packed_run_to_firestore(run_name, channel_series(channs), freq, *segment_store())
+            # Cached reads of an earlier upload of this run are stale now
+            invalidate_run(run_name)
 
-def process_and_upload_ld_files(driver_id):
+            if progress is not None:
+                progress((n + 1) / len(groups))
+
+
+def segment_store():
+    '''
+        The functions full-rate segments are stored and deleted with, per settings.LD_SEGMENT_STORAGE ((None, None) keeps them in Firestore)
     '''
-        Process LD (Logical Data) files in the data directory, convert them to CSV format, and upload the CSV files to Firestore.
+    if settings.LD_SEGMENT_STORAGE == 's3':
+        # Imported here so Firestore-only deployments do not need AWS configured
+        from ..aws import delete_from_s3, upload_to_s3
+        return (lambda key, data: upload_to_s3(io.BytesIO(data), key)), delete_from_s3
+    return None, None
 
-    This function performs the following steps:
+
+def channel_series(channs):
+    '''
+        Yield (name, data) for each channel whose data can be read, one channel in memory at a time
     '''
-    try:
-        data_path = settings.DATA_DIR
-        os.makedirs(data_path, exist_ok=True)
+    for chann in channs:
+        try:
+            yield chann.name, chann.read()
+        except ValueError as v:
+            print(v, chann.name, chann.freq, hex(chann.data_ptr), hex(chann.data_len))
 
-        for filename in os.listdir(data_path):
-            print(filename)
-            if not filename.endswith('.ld'):
-                continue
-            file_path = os.path.join(data_path, filename)
-            
-            # Parsing LD into CSV
-            l = ldData.fromfile(file_path)
-
-            df_dict = l.to_dataframe()
-            min_length = min(df_dict.keys())
-
-            for length, df in df_dict.items(): 
-                csv_filename = os.path.join(data_path, os.path.splitext(filename)[0] + '-' + str(math.ceil(length/min_length)) + '-hz' + '.csv')
-                df.to_csv(csv_filename, index=False)
-                print(f"Data saved to {csv_filename}")
-
-                # Uploading CSV to Firebase
-                upload_csv_to_firestore(csv_filename, driver_id)
-                print(f"Data from {csv_filename} uploaded to Firestore")
-                
-
-        # Deleting all files in the folder after processing
-        for filename in os.listdir(data_path):
-            file_path = os.path.join(data_path, filename)
-            if filename.endswith('.ld') or filename.endswith('.csv'):
-                try:
-                    os.remove(file_path)
-                    print(f"Deleted {file_path}")
-                except Exception as e:
-                    print(f"Failed to delete {file_path}: {e}")
-    except Exception as e:
-        print(e)
 
+def export_csv(l, channs, csv_filename):
+    '''
+        Write one rate group of a parsed LD file to CSV, for debugging uploads
+    '''
+    os.makedirs(os.path.dirname(csv_filename), exist_ok=True)
+    columns = [c.name for c in channs]
+    with open(csv_filename, 'w', newline='') as csv_file:
+        for n, (_, block) in enumerate(l.iter_chunks(channs)):
+            pd.DataFrame(block, columns=columns).to_csv(csv_file, header=(n == 0), index=False)
+    print(f"Data saved to {csv_filename}")
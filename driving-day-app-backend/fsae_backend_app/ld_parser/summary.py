@@ -0,0 +1,107 @@
+import math
+import numpy as np
+
+# Bucket widths in seconds of the rollups computed for every run
+ROLLUP_RESOLUTIONS = (1, 10, 60)
+
+# Reductions available to settings.RUN_KEY_POINTS, each over every sample of a channel.
+# 'laps' is the number of values a lap counter passes through, its range plus one, so a
+# counter starting at 0 and one starting at 1 both count the lap they start on, and noise
+# stepping the counter back and forth is not counted as laps
+KEY_POINT_STATS = {
+    'max': lambda data: float(data.max()),
+    'min': lambda data: float(data.min()),
+    'mean': lambda data: float(data.mean(dtype=np.float64)),
+    'laps': lambda data: int(round(float(data.max()) - float(data.min()))) + 1,
+}
+
+
+def compute_rollups(channs, freq, resolutions=ROLLUP_RESOLUTIONS):
+    """
+    Compute min/max/mean rollups of one rate group at several bucket widths.
+
+    Every sample of every channel is used, not just the whole-second rows that are uploaded,
+    and the rollups cover the whole run. Buckets are aligned to the start of the log; the
+    last bucket may be partial. Buckets past the end of a channel that stopped early, and
+    every bucket of a channel whose data cannot be read, are NaN.
+
+    Args:
+        channs (list of ldChan): The channels of the rate group.
+        freq (int): Their sample rate in Hz.
+        resolutions (tuple of int): The bucket widths in seconds.
+
+    Returns:
+        dict: Keyed by resolution, each a dict of 'min', 'max' and 'mean' float32 arrays
+            shaped (channels, buckets).
+    """
+    length = max((x.data_len for x in channs), default=0)
+    rollups = {}
+    for resolution in resolutions:
+        buckets = math.ceil(length / (freq * resolution))
+        rollups[resolution] = {stat: np.full((len(channs), buckets), np.nan, dtype=np.float32)
+                               for stat in ('min', 'max', 'mean')}
+
+    for i, chann in enumerate(channs):
+        try:
+            # Not cached on the channel, so only one channel is held at a time
+            data = chann.read()
+        except ValueError as v:
+            print(v, chann.name, chann.freq, hex(chann.data_ptr), hex(chann.data_len))
+            continue
+
+        for resolution, stats in rollups.items():
+            width = freq * resolution
+            full = len(data) // width
+            if full:
+                whole = data[:full * width].reshape(full, width)
+                stats['min'][i, :full] = whole.min(axis=1)
+                stats['max'][i, :full] = whole.max(axis=1)
+                stats['mean'][i, :full] = whole.mean(axis=1, dtype=np.float64)
+            tail = data[full * width:]
+            if len(tail):
+                stats['min'][i, full] = tail.min()
+                stats['max'][i, full] = tail.max()
+                stats['mean'][i, full] = tail.mean(dtype=np.float64)
+    return rollups
+
+
+def compute_key_points(channs, definitions):
+    """
+    Compute per-run statistics, such as the highest coolant temperature, from every sample.
+
+    Each channel named by a definition is read once, however many definitions use it.
+    Definitions whose channel is missing or unreadable, or whose stat is unknown, are
+    skipped.
+
+    Args:
+        channs (list of ldChan): The channels of the run, of any rates.
+        definitions (list of dict): {"label", "channel", "stat"} each, with stat a key of
+            KEY_POINT_STATS; see settings.RUN_KEY_POINTS.
+
+    Returns:
+        dict: The value of each computed statistic, keyed by label.
+    """
+    wanted = {}
+    for definition in definitions:
+        if definition['stat'] not in KEY_POINT_STATS:
+            print(f"Unknown key point stat {definition['stat']!r} for {definition['label']!r}")
+            continue
+        wanted.setdefault(definition['channel'], []).append(definition)
+
+    key_points = {}
+    for chann in channs:
+        if chann.name not in wanted:
+            continue
+        try:
+            data = chann.read()
+        except ValueError as v:
+            print(v, chann.name, chann.freq, hex(chann.data_ptr), hex(chann.data_len))
+            continue
+        data = data[~np.isnan(data)]
+        if not len(data):
+            continue
+        for definition in wanted.pop(chann.name):
+            value = KEY_POINT_STATS[definition['stat']](data)
+            # Samples are float32; more digits than that would only be noise
+            key_points[definition['label']] = float(f'{value:.7g}') if isinstance(value, float) else value
+    return key_points
@@ -0,0 +1,94 @@
+import datetime
+import struct
+import numpy as np
+from .data_containers import ldChan, ldHead
+
+# (dtype_a, dtype) codes `ldChan.fromfields` maps to each sample type
+DTYPE_CODES = {
+    'float16': (0x07, 2),
+    'float32': (0x07, 4),
+    'int16': (0x03, 2),
+    'int32': (0x05, 4),
+}
+
+
+def write_ld_file(file_path, num_channs=50, duration=60, rates=(1, 10, 20, 50, 100),
+                  dtypes=('float32', 'int16', 'int32', 'float16'), seed=0, when=None, durations=None, shift=0):
+    """
+    Write a synthetic ld file laid out as `ldHead.fmt` and `ldChan.fmt` describe.
+
+    Channels are assigned rates and sample types round-robin from `rates` and `dtypes`, and
+    hold a noisy sine wave so scaled values vary like real telemetry. Integer channels are
+    stored with one decimal place. Channel metadata is written as one contiguous block
+    followed by the channel data in channel order, as MoTeC loggers do.
+
+    Args:
+        file_path (str): The path to write the ld file to.
+        num_channs (int): The number of channels.
+        duration (int): The length of the log in seconds.
+        rates (tuple of int): The sample rates in Hz to cycle through.
+        dtypes (tuple of str): The sample types to cycle through; keys of `DTYPE_CODES`.
+        seed (int): Seed for the generated samples, so files are reproducible.
+        when (datetime.datetime, optional): The session start written to the header.
+        durations (dict, optional): Lengths in seconds of channels that stop before the end
+            of the log, keyed by channel number.
+        shift (int): The shift written for every channel, added to scaled samples before `mul`.
+
+    Returns:
+        str: `file_path`.
+
+    Raises:
+        ValueError: If a dtype is not one ld files can store.
+    """
+    unknown = set(dtypes) - set(DTYPE_CODES)
+    if unknown:
+        raise ValueError(f"Unsupported ld dtypes: {sorted(unknown)}")
+    when = when or datetime.datetime(2024, 11, 23, 10, 12, 13)
+    rng = np.random.default_rng(seed)
+
+    head_size = struct.calcsize(ldHead.fmt)
+    chann_size = struct.calcsize(ldChan.fmt)
+    meta_ptr = head_size
+    data_ptr = meta_ptr + num_channs * chann_size
+
+    metas, blobs = [], []
+    offset = data_ptr
+    for n in range(num_channs):
+        freq = rates[n % len(rates)]
+        dtype = dtypes[n % len(dtypes)]
+        dtype_a, dtype_code = DTYPE_CODES[dtype]
+        dec = 1 if dtype.startswith('int') else 0
+
+        t = np.arange((durations or {}).get(n, duration) * freq) / freq
+        values = 50 * np.sin(2 * np.pi * t / (10 + n % 50)) + rng.standard_normal(len(t))
+        raw = np.round(values * 10 ** dec).astype(dtype)
+        blob = raw.tobytes()
+
+        this_ptr = meta_ptr + n * chann_size
+        metas.append(struct.pack(
+            ldChan.fmt,
+            this_ptr - chann_size if n > 0 else 0,
+            this_ptr + chann_size if n < num_channs - 1 else 0,
+            offset, len(raw), 0x2ee1 + n,
+            dtype_a, dtype_code, freq,
+            shift, 1, 1, dec,
+            f'Channel {n}'.encode('ascii'), f'ch{n}'.encode('ascii'), b'C'))
+        blobs.append(blob)
+        offset += len(blob)
+
+    head = struct.pack(
+        ldHead.fmt,
+        0x40, meta_ptr, data_ptr, 0,
+        1, 0x4240, 0xf,
+        1234, b'ADL', 420, 0xadb0, num_channs,
+        when.strftime('%d/%m/%Y').encode('ascii'), when.strftime('%H:%M:%S').encode('ascii'),
+        b'Synthetic Driver', b'Synthetic Car', b'Synthetic Venue',
+        0xc81a4, b'synthetic')
+
+    with open(file_path, 'wb') as f:
+        f.write(head)
+        for meta in metas:
+            f.write(meta)
+        for blob in blobs:
+            f.write(blob)
+    return file_path
@@ -0,0 +1,53 @@
+import os
+import tempfile
+from django.core.management.base import BaseCommand, CommandError
+from ...ld_parser import benchmark
+
+DEFAULT_BASELINES = os.path.join(os.path.dirname(benchmark.__file__), 'benchmark_baselines.json')
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the LD parser and upload pipeline (with Firestore stubbed out) on a synthetic "
+        "log, and compare against stored baselines."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--channels', type=int, default=benchmark.DEFAULT_CHANNS,
+                            help="Channels in the synthetic log")
+        parser.add_argument('--duration', type=int, default=benchmark.DEFAULT_DURATION,
+                            help="Length of the synthetic log in seconds")
+        parser.add_argument('--rounds', type=int, default=5, help="Timed rounds per benchmark")
+        parser.add_argument('--case', action='append', dest='cases',
+                            help="Only run this benchmark (may be repeated)")
+        parser.add_argument('--baselines', default=DEFAULT_BASELINES,
+                            help="JSON file of baseline results")
+        parser.add_argument('--save-baselines', action='store_true',
+                            help="Store these results as the new baselines instead of comparing")
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help="Allowed slowdown or memory growth over the baselines, as a fraction")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory(prefix='ld-benchmark-') as workdir:
+            results = benchmark.run_benchmarks(workdir, options['channels'], options['duration'],
+                                               options['rounds'], options['cases'])
+
+        baselines = benchmark.load_baselines(options['baselines'])
+        self.stdout.write(f"{'benchmark':<30}{'median':>12}{'min':>12}{'peak memory':>14}{'vs baseline':>14}")
+        for name, result in results.items():
+            baseline = baselines.get(name)
+            change = ''
+            if baseline is not None and baseline['channels'] == result['channels'] \
+                    and baseline['duration'] == result['duration']:
+                change = f"{result['median'] / baseline['median'] - 1:+.0%}"
+            self.stdout.write(f"{name:<30}{result['median'] * 1000:>10.1f}ms{result['min'] * 1000:>10.1f}ms"
+                              f"{result['peak_bytes'] / 1024 ** 2:>12.1f}MB{change:>14}")
+
+        if options['save_baselines']:
+            benchmark.save_baselines(options['baselines'], results)
+            self.stdout.write(f"Saved baselines to {options['baselines']}")
+            return
+
+        regressions = benchmark.compare(results, baselines, options['tolerance'])
+        if regressions:
+            raise CommandError("Benchmark regressions:\n" + "\n".join(regressions))
@@ -0,0 +1,60 @@
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...ld_parser.batch import decode_ld_files, default_workers
+from ...ld_parser.cache import ldCache
+
+
+class Command(BaseCommand):
+    help = (
+        "Decode a batch of LD files (e.g. a whole test day) in parallel worker processes, "
+        "and optionally upload each one to Firestore."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+',
+                            help="LD files, or directories whose .ld files should be ingested")
+        parser.add_argument('--workers', type=int, default=None,
+                            help=f"Worker processes to decode with (default: {default_workers()})")
+        parser.add_argument('--driver-id', default=None,
+                            help="Upload each decoded file to Firestore under this driver")
+
+    def handle(self, *args, **options):
+        file_paths = []
+        for path in options['paths']:
+            if os.path.isdir(path):
+                file_paths += sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith('.ld'))
+            elif os.path.isfile(path):
+                file_paths.append(path)
+            else:
+                raise CommandError(f"No such file or directory: {path}")
+
+        cache = ldCache(settings.LD_CACHE_DIR, settings.LD_CACHE_MAX_BYTES)
+        start = time.perf_counter()
+        results = decode_ld_files(file_paths, cache, workers=options['workers'])
+        elapsed = time.perf_counter() - start
+
+        for file_path, ld in zip(file_paths, results):
+            if ld is None:
+                self.stderr.write(f"{file_path}: failed to decode")
+                continue
+            rates = ", ".join(f"{freq} Hz x {len(channs)}" for freq, channs in sorted(ld.group_by_freq().items()))
+            self.stdout.write(f"{file_path}: {len(ld.channs)} channels ({rates})")
+            ld.close()
+        self.stdout.write(f"Decoded {len(file_paths)} files in {elapsed:.2f}s")
+
+        if options['driver_id']:
+            # Imported here so decoding alone does not need Firebase credentials
+            from ...ld_parser.main import process_and_upload_ld_file
+            failed = 0
+            for file_path, ld in zip(file_paths, results):
+                if ld is None:
+                    continue
+                try:
+                    process_and_upload_ld_file(file_path, options['driver_id'], cache=cache)
+                except Exception as e:
+                    self.stderr.write(f"{file_path}: failed to upload: {e}")
+                    failed += 1
+            if failed:
+                raise CommandError(f"{failed} of {len(file_paths)} files failed to upload")
@@ -0,0 +1,58 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+# Read endpoints that go to Firestore on every request; the run data endpoints are cached
+DEFAULT_PATHS = ['/api/all-issues', '/api/all-drivers?height=-1&weight=-1']
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test a running server with concurrent GET requests and report throughput and "
+        "latency per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the server")
+        parser.add_argument('--path', action='append', dest='paths',
+                            help="Endpoint path and query string to request (may be repeated)")
+        parser.add_argument('--concurrency', type=int, default=20, help="Requests in flight at once")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint")
+        parser.add_argument('--timeout', type=float, default=30, help="Timeout per request in seconds")
+
+    def handle(self, *args, **options):
+        base = options['url'].rstrip('/')
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=options['concurrency'])
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        def fetch(url):
+            start = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=options['timeout']).status_code < 400
+            except requests.RequestException:
+                ok = False
+            return time.perf_counter() - start, ok
+
+        self.stdout.write(f"{'endpoint':<50}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'errors':>8}")
+        failed = False
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            for path in options['paths'] or DEFAULT_PATHS:
+                url = base + path
+                start = time.perf_counter()
+                results = list(pool.map(fetch, [url] * options['requests']))
+                elapsed = time.perf_counter() - start
+
+                latencies = sorted(latency for latency, _ in results)
+                errors = sum(not ok for _, ok in results)
+                failed = failed or errors == len(results)
+                p50, p95, p99 = (statistics.quantiles(latencies, n=100)[q - 1] * 1000 if len(latencies) > 1
+                                 else latencies[0] * 1000 for q in (50, 95, 99))
+                self.stdout.write(f"{path[:49]:<50}{len(results) / elapsed:>10.1f}{p50:>8.0f}ms"
+                                  f"{p95:>8.0f}ms{p99:>8.0f}ms{errors:>8}")
+
+        if failed:
+            raise CommandError(f"Every request to at least one endpoint failed; is the server running at {base}?")
@@ -0,0 +1,48 @@
+from django.db import models
+
+
+class IngestionJob(models.Model):
+    """
+    An uploaded LD file waiting to be, or being, parsed and uploaded to Firestore.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    file_path = models.CharField(max_length=512)
+    run_title = models.CharField(max_length=256)
+    run_date = models.CharField(max_length=64)
+    driver_id = models.CharField(max_length=128)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    # Fraction of the file's rate groups uploaded so far, from 0 to 1
+    progress = models.FloatField(default=0)
+    message = models.TextField(blank=True, default='')
+    # The server process (host:pid) running the job, so jobs it leaves behind can be requeued
+    worker = models.CharField(max_length=128, blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def to_dict(self):
+        return {
+            "jobId": self.id,
+            "runTitle": self.run_title,
+            "runDate": self.run_date,
+            "driverId": self.driver_id,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "createdAt": self.created_at.isoformat(),
+            "updatedAt": self.updated_at.isoformat(),
+        }
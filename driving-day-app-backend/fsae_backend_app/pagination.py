@@ -0,0 +1,43 @@
+"""
+pagination.py
+
+Opaque cursor tokens for paging through the per-second documents of a run.
+
+A token records the run, the document a page starts after or ends before, and which of the
+two it is, so a page can be queried with `start_after`/`end_before` on the document ID
+alone, without first reading the document to build a snapshot cursor. Tokens are only
+encoded, not signed: they carry nothing a client could not request directly.
+"""
+import base64
+import json
+
+AFTER = 'after'
+BEFORE = 'before'
+
+
+def encode_cursor(run_title, direction, doc_id):
+    """
+    Encode a cursor to the page after (`AFTER`) or before (`BEFORE`) the document `doc_id`.
+    """
+    payload = json.dumps([run_title, direction, doc_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(token, run_title):
+    """
+    Decode a token made by `encode_cursor` for `run_title`.
+
+    Returns:
+        tuple: (direction, doc_id)
+
+    Raises:
+        ValueError: If the token is malformed or belongs to a different run.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        token_run, direction, doc_id = json.loads(payload)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page cursor: {e}")
+    if token_run != run_title or direction not in (AFTER, BEFORE) or not isinstance(doc_id, str):
+        raise ValueError("Invalid page cursor for this run")
+    return direction, doc_id
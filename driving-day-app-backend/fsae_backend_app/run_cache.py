@@ -0,0 +1,245 @@
+"""
+run_cache.py
+
+Caches run data read from Firestore. Runs do not change once ingested, so repeated
+dashboard loads are served from the cache; the ingestion pipeline invalidates a run when it
+rewrites it, and the run list whenever any run is written.
+
+The cache is the Django cache named by settings.RUN_DATA_CACHE, so the backend is chosen
+in settings.CACHES: `MemoryCappedCache` below for a single process, or a shared backend
+such as Redis when several processes (or the ingest_ld_files command) must see each
+other's invalidations.
+"""
+import asyncio
+import hashlib
+import json
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+
+# Entry sizes and their total for each named MemoryCappedCache, shared like LocMemCache's stores
+_sizes = {}
+_totals = {}
+
+_stats_lock = Lock()
+_hits = Counter()
+_misses = Counter()
+
+# Prefetches run on their own threads, so they outlive the request (and, over WSGI, the
+# event loop) that started them
+_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='prefetch')
+
+
+class MemoryCappedCache(LocMemCache):
+    """LocMemCache bounded by the total size of its pickled entries rather than their count.
+
+    Least recently used entries are evicted once the cache would grow past OPTIONS['MAX_BYTES'],
+    and values larger than that are never stored.
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._max_bytes = int(params.get('OPTIONS', {}).get('MAX_BYTES', 256 * 1024 ** 2))
+        self._sizes = _sizes.setdefault(name, {})
+        self._total = _totals.setdefault(name, [0])
+
+    @property
+    def size(self):
+        """The total size in bytes of the pickled entries held."""
+        return self._total[0]
+
+    def _track(self, key, size):
+        self._total[0] += size - self._sizes.pop(key, 0)
+        if size:
+            self._sizes[key] = size
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self._delete(key)
+        if len(value) > self._max_bytes:
+            return
+        # The least recently used entry is last; see LocMemCache.get
+        while self._cache and self._total[0] + len(value) > self._max_bytes:
+            evicted, _ = self._cache.popitem()
+            self._expire_info.pop(evicted, None)
+            self._track(evicted, 0)
+        super()._set(key, value, timeout)
+        self._track(key, len(value))
+
+    def _cull(self):
+        super()._cull()
+        for key in set(self._sizes) - set(self._cache):
+            self._track(key, 0)
+
+    def _delete(self, key):
+        self._track(key, 0)
+        return super()._delete(key)
+
+    def incr(self, key, delta=1, version=None):
+        value = super().incr(key, delta, version)
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if key in self._cache:
+                self._track(key, len(self._cache[key]))
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._sizes.clear()
+            self._total[0] = 0
+        super().clear()
+
+    # The base async methods run the sync ones through thread-sensitive sync_to_async, so
+    # concurrent async views would queue on one thread for what is only an in-memory lookup
+    async def aget(self, key, default=None, version=None):
+        return self.get(key, default, version)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set(key, value, timeout, version)
+
+    async def aadd(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.add(key, value, timeout, version)
+
+    async def adelete(self, key, version=None):
+        return self.delete(key, version)
+
+
+def get_run_cache():
+    """
+    Return the Django cache run data is kept in.
+    """
+    return caches[settings.RUN_DATA_CACHE]
+
+
+def cached_run_data(kind, run_title, params, load):
+    """
+    Return cached run data, loading and caching it on a miss.
+
+    Args:
+        kind (str): What is being read, e.g. 'specific'; counted separately in `cache_stats`.
+        run_title (str): The run the data belongs to, or None for data about all runs.
+        params: JSON-serializable request parameters that select the data (categories, page...).
+        load (callable): Reads the data from Firestore. Results of None (errors) are not cached.
+
+    Returns:
+        The cached or freshly loaded data.
+    """
+    cache = get_run_cache()
+    key = _cache_key(cache, kind, run_title, params)
+    data = cache.get(key)
+    if data is not None:
+        _count(_hits, kind)
+        return data
+
+    _count(_misses, kind)
+    data = load()
+    if data is not None:
+        cache.set(key, data)
+    return data
+
+
+async def acached_run_data(kind, run_title, params, load):
+    """
+    Async version of `cached_run_data`, for views that load run data with the async client.
+
+    Args:
+        load (callable): Returns an awaitable that reads the data from Firestore.
+    """
+    cache = get_run_cache()
+    key = await _acache_key(cache, kind, run_title, params)
+    data = await cache.aget(key)
+    if data is not None:
+        _count(_hits, kind)
+        return data
+
+    _count(_misses, kind)
+    data = await load()
+    if data is not None:
+        await cache.aset(key, data)
+    return data
+
+
+def prefetch_run_data(kind, run_title, params, load):
+    """
+    Load run data into the cache in the background, as `acached_run_data` would, so that a
+    request for it that is likely to follow is a hit. Returns without waiting for the load.
+    """
+    _prefetch_executor.submit(_prefetch, kind, run_title, params, load)
+
+
+def _prefetch(kind, run_title, params, load):
+    try:
+        asyncio.run(acached_run_data(kind, run_title, params, load))
+    except Exception as e:
+        print(f"An unexpected error occurred while prefetching run data: {e}")
+
+
+def invalidate_run(run_title):
+    """
+    Drop every cached read of `run_title`, and of the run list, e.g. after it is re-ingested.
+    """
+    cache = get_run_cache()
+    cache.set(_generation_key(run_title), uuid.uuid4().hex, None)
+    cache.set(_generation_key(None), uuid.uuid4().hex, None)
+
+
+def cache_stats():
+    """
+    Hit and miss counts of this process per kind of read, since it started.
+
+    Returns:
+        dict: {"hits": {...}, "misses": {...}, "hitRate": float or None, "sizeBytes": int or None},
+              where sizeBytes is only known for `MemoryCappedCache`.
+    """
+    with _stats_lock:
+        hits, misses = dict(_hits), dict(_misses)
+    total = sum(hits.values()) + sum(misses.values())
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hitRate": sum(hits.values()) / total if total else None,
+        "sizeBytes": getattr(get_run_cache(), 'size', None),
+    }
+
+
+def _count(counter, kind):
+    with _stats_lock:
+        counter[kind] += 1
+
+
+def _generation_key(run_title):
+    return 'run-data-generation:' + hashlib.sha256(json.dumps(run_title).encode()).hexdigest()
+
+
+def _cache_key(cache, kind, run_title, params):
+    """
+    Key of one read, including the current generation of its run.
+
+    Invalidating a run replaces its generation, so its old entries are never read again and
+    age out of the cache. A generation is a random token rather than a counter so that one
+    evicted and recreated can never match entries from before an invalidation.
+    """
+    generation_key = _generation_key(run_title)
+    generation = cache.get(generation_key)
+    if generation is None:
+        cache.add(generation_key, uuid.uuid4().hex, None)
+        generation = cache.get(generation_key)
+    return _read_key(kind, run_title, generation, params)
+
+
+async def _acache_key(cache, kind, run_title, params):
+    generation_key = _generation_key(run_title)
+    generation = await cache.aget(generation_key)
+    if generation is None:
+        await cache.aadd(generation_key, uuid.uuid4().hex, None)
+        generation = await cache.aget(generation_key)
+    return _read_key(kind, run_title, generation, params)
+
+
+def _read_key(kind, run_title, generation, params):
+    return 'run-data:' + hashlib.sha256(
+        json.dumps([kind, run_title, generation, params]).encode()).hexdigest()
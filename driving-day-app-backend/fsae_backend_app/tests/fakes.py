@@ -0,0 +1,156 @@
+"""
+In-memory stand-ins for the Firestore client, holding documents in a dict keyed by path.
+"""
+from threading import Lock
+
+
+class FakeFirestore(object):
+    """Supports the document, collection, query and batch calls the upload pipeline and run reads make."""
+
+    def __init__(self):
+        self.documents = {}
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def commit(self, batch):
+        """Apply the operations of `batch`; override to make commits fail."""
+        for doc_ref, data in batch.ops:
+            if data is None:
+                doc_ref.delete()
+            else:
+                doc_ref.set(data)
+
+    def collection_documents(self, path):
+        """The documents directly under the collection at `path`, by ID."""
+        prefix = path + '/'
+        return {key[len(prefix):]: data for key, data in self.documents.items()
+                if key.startswith(prefix) and '/' not in key[len(prefix):]}
+
+
+class FakeQuery(object):
+    """A query over the documents of a collection, always in document ID order."""
+
+    def __init__(self, collection, fields=None, after=None, before=None, limit=None, last=False):
+        self.collection = collection
+        self.fields, self.after, self.before, self.count, self.last = fields, after, before, limit, last
+
+    def _with(self, **changes):
+        query = FakeQuery(self.collection, self.fields, self.after, self.before, self.count, self.last)
+        query.__dict__.update(changes)
+        return query
+
+    def select(self, field_paths):
+        return self._with(fields=[field.strip('`') for field in field_paths])
+
+    def order_by(self, field):
+        if field != '__name__':
+            raise NotImplementedError(field)
+        return self
+
+    def start_after(self, values):
+        return self._with(after=values['__name__'])
+
+    def end_before(self, values):
+        return self._with(before=values['__name__'])
+
+    def limit(self, count):
+        return self._with(count=count, last=False)
+
+    def limit_to_last(self, count):
+        return self._with(count=count, last=True)
+
+    def get(self):
+        documents = sorted(self.collection.client.collection_documents(self.collection.path).items())
+        documents = [(doc_id, data) for doc_id, data in documents
+                     if (self.after is None or doc_id > self.after)
+                     and (self.before is None or doc_id < self.before)]
+        if self.count is not None:
+            documents = documents[max(0, len(documents) - self.count):] if self.last else documents[:self.count]
+        if self.fields is not None:
+            documents = [(doc_id, {f: data[f] for f in self.fields if f in data}) for doc_id, data in documents]
+        return [FakeSnapshot(doc_id, data) for doc_id, data in documents]
+
+    def stream(self):
+        if self.last:
+            raise ValueError('limit_to_last queries cannot be streamed')
+        return iter(self.get())
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, client, path):
+        super().__init__(self)
+        self.client, self.path = client, path
+
+    def document(self, doc_id):
+        return FakeDocument(self.client, f'{self.path}/{doc_id}')
+
+
+class FakeDocument(object):
+    def __init__(self, client, path):
+        self.client, self.path = client, path
+        self.id = path.rsplit('/', 1)[-1]
+
+    def collection(self, name):
+        return FakeCollection(self.client, f'{self.path}/{name}')
+
+    def set(self, data):
+        self.client.documents[self.path] = dict(data)
+
+    def delete(self):
+        self.client.documents.pop(self.path, None)
+
+    def get(self, field_paths=None):
+        return FakeSnapshot(self.id, self.client.documents.get(self.path))
+
+
+class FakeSnapshot(object):
+    def __init__(self, doc_id, data):
+        self.id, self._data = doc_id, data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return self._data[field]
+
+
+class FakeBatch(object):
+    """A write batch that applies its operations on commit."""
+
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def set(self, doc_ref, data):
+        self.ops.append((doc_ref, data))
+
+    def delete(self, doc_ref):
+        self.ops.append((doc_ref, None))
+
+    def commit(self):
+        self.client.commit(self)
+
+
+class FlakyFirestore(FakeFirestore):
+    """Fails the first `failures` batch commits, and records the size of every commit attempted."""
+
+    def __init__(self, failures, error=ConnectionError('deadline exceeded')):
+        super().__init__()
+        self.failures = failures
+        self.error = error
+        self.commits = []
+        self._lock = Lock()
+
+    def commit(self, batch):
+        with self._lock:
+            self.commits.append(len(batch.ops))
+            fail = self.failures > 0
+            self.failures -= 1
+        if fail:
+            raise self.error
+        super().commit(batch)
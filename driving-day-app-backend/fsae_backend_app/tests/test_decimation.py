@@ -0,0 +1,19 @@
+import unittest
+import numpy as np
+from fsae_backend_app.decimation import lttb, min_max
+
+
+class PointLimitTests(unittest.TestCase):
+
+    def test_never_more_than_points(self):
+        values = np.sin(np.arange(1000) / 7.0) * np.arange(1000)
+        for decimate in (min_max, lttb):
+            for points in (-1, 0, 1, 2, 3, 7, 10, 999, 1000, 2000):
+                kept = decimate(values, points)
+                self.assertLessEqual(len(kept), max(points, 0), msg=(decimate.__name__, points))
+                self.assertTrue(np.all(np.diff(kept) > 0), msg=(decimate.__name__, points))
+
+    def test_min_max_single_point_keeps_largest_spike(self):
+        values = np.zeros(100)
+        values[30], values[60] = 5.0, -9.0
+        np.testing.assert_array_equal(min_max(values, 1), [60])
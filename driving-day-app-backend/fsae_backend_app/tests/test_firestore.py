@@ -0,0 +1,160 @@
+import os
+import tempfile
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+from fsae_backend_app.ld_parser.benchmark import _import_pipeline
+from fsae_backend_app.ld_parser.synthetic import write_ld_file
+from .fakes import FakeDocument, FakeFirestore, FlakyFirestore
+
+
+class UploadRunTests(SimpleTestCase):
+
+    def setUp(self):
+        self.client = FakeFirestore()
+        self.main, self.firestore = _import_pipeline(self.client)
+        patcher = mock.patch.object(self.firestore, 'db', self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.workdir = workdir.name
+
+    def upload(self, file_path):
+        with override_settings(LD_CACHE_DIR=os.path.join(self.workdir, 'cache'), LD_CSV_EXPORT_DIR=None,
+                               LD_SEGMENT_STORAGE='firestore', RUN_KEY_POINTS=[]), \
+                mock.patch('builtins.print'):
+            self.main.process_and_upload_ld_file(file_path, 'driver')
+
+    def test_rows_stop_where_a_channel_of_the_rate_group_ends(self):
+        # Channels 0 and 1 are both 1 Hz; channel 1 stops 4 seconds before the end
+        file_path = write_ld_file(os.path.join(self.workdir, '2024-11-23-short.ld'), num_channs=2,
+                                  duration=10, rates=(1,), dtypes=('float32',), durations={1: 6})
+        self.upload(file_path)
+
+        rows = self.client.collection_documents('ecu-data/2024-11-23-short-1-hz/data')
+        self.assertEqual(sorted(rows), [f'data_{n:06}' for n in range(6)])
+        self.assertTrue(all(None not in row.values() for row in rows.values()))
+        manifest = self.client.documents['ecu-data/2024-11-23-short-1-hz/channels/manifest']
+        self.assertEqual({name: channel['count'] for name, channel in manifest['channels'].items()},
+                         {'Channel 0': 10, 'Channel 1': 6})
+
+    def test_one_off_upload_is_not_copied_into_the_parse_cache(self):
+        file_path = write_ld_file(os.path.join(self.workdir, '2024-11-23-once.ld'), num_channs=4, duration=5)
+        self.upload(file_path)
+
+        self.assertIn('ecu-data/2024-11-23-once-1-hz', self.client.documents)
+        cache_dir = os.path.join(self.workdir, 'cache')
+        self.assertFalse(os.path.exists(cache_dir) and os.listdir(cache_dir))
+
+
+class BatchWriterTests(SimpleTestCase):
+
+    def setUp(self):
+        _, self.firestore = _import_pipeline(FakeFirestore())
+        patcher = mock.patch.object(self.firestore.time, 'sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, client, count, **kwargs):
+        writer = self.firestore.BatchWriter(client, **kwargs)
+        with mock.patch('builtins.print'):
+            with writer:
+                for n in range(count):
+                    writer.set(client.collection('rows').document(f'data_{n:06}'), {'n': n})
+        return writer
+
+    def test_writes_are_split_into_batches_of_at_most_500(self):
+        client = FlakyFirestore(failures=0)
+        writer = self.write(client, 1200, batch_size=1000)
+
+        self.assertEqual(sorted(client.commits), [200, 500, 500])
+        self.assertEqual(len(client.collection_documents('rows')), 1200)
+        self.assertEqual(writer.rows_written, 1200)
+
+    def test_transient_failures_are_retried_with_backoff(self):
+        client = FlakyFirestore(failures=2)
+        writer = self.write(client, 10, backoff=0.5)
+
+        self.assertEqual(client.commits, [10, 10, 10])
+        self.assertEqual(len(client.collection_documents('rows')), 10)
+        self.assertEqual(writer.rows_written, 10)
+        # Doubled per retry, with up to as much again of jitter
+        first, second = (call.args[0] for call in self.sleep.call_args_list)
+        self.assertTrue(0.5 <= first < 1.0, first)
+        self.assertTrue(1.0 <= second < 2.0, second)
+
+    def test_permanent_failure_is_raised_from_close(self):
+        client = FlakyFirestore(failures=float('inf'))
+        writer = self.firestore.BatchWriter(client, max_retries=3)
+        for n in range(600):
+            writer.set(client.collection('rows').document(f'data_{n:06}'), {'n': n})
+
+        with mock.patch('builtins.print'), self.assertRaises(ConnectionError):
+            writer.close()
+        # Both batches gave up after three attempts each
+        self.assertEqual(sorted(client.commits), [100, 100, 100, 500, 500, 500])
+        self.assertEqual(self.sleep.call_count, 4)
+        self.assertEqual(client.collection_documents('rows'), {})
+        self.assertEqual(writer.rows_written, 0)
+
+    def test_failure_does_not_hide_the_error_that_ended_the_block(self):
+        client = FlakyFirestore(failures=float('inf'))
+        with mock.patch('builtins.print'), self.assertRaises(KeyError):
+            with self.firestore.BatchWriter(client, max_retries=1) as writer:
+                writer.set(client.collection('rows').document('data_000000'), {'n': 0})
+                raise KeyError('Speed')
+
+
+class PackedRunDataTests(SimpleTestCase):
+
+    def setUp(self):
+        self.client = FakeFirestore()
+        _, self.firestore = _import_pipeline(self.client)
+        patcher = mock.patch.object(self.firestore, 'db', self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_run_without_a_manifest_is_not_found(self):
+        with self.assertRaises(self.firestore.RunNotFound):
+            self.firestore.get_packed_run_data('2024-11-23-missing-100-hz', ['Speed'])
+
+    def test_failed_manifest_read_is_an_error(self):
+        with mock.patch.object(FakeDocument, 'get', side_effect=OSError('unavailable')), \
+                mock.patch('builtins.print'):
+            self.assertIsNone(self.firestore.get_packed_run_data('2024-11-23-endurance-100-hz', ['Speed']))
+
+
+class PaginatedRunDataTests(SimpleTestCase):
+    run_title = '2024-11-23-endurance-1-hz'
+
+    def setUp(self):
+        self.client = FakeFirestore()
+        _, self.firestore = _import_pipeline(self.client)
+        patcher = mock.patch.object(self.firestore, 'db', self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        rows = self.client.collection('ecu-data').document(self.run_title).collection('data')
+        for n in range(7):
+            rows.document(f'data_{n:06}').set({'Speed': float(n), 'RPM': 1000.0 * n})
+
+    def page(self, **kwargs):
+        page = self.firestore.get_specific_run_data_paginated(self.run_title, 3, **kwargs)
+        return [doc['id'][-1] for doc in page['documents']], page['hasPrevious'], page['hasNext']
+
+    def test_forward_pages(self):
+        self.assertEqual(self.page(), (['0', '1', '2'], False, True))
+        self.assertEqual(self.page(start_after_doc='data_000002'), (['3', '4', '5'], True, True))
+        self.assertEqual(self.page(start_after_doc='data_000005'), (['6'], True, False))
+
+    def test_backward_pages(self):
+        self.assertEqual(self.page(end_before_doc='data_000006'), (['3', '4', '5'], True, True))
+        self.assertEqual(self.page(end_before_doc='data_000003'), (['0', '1', '2'], False, True))
+
+    def test_page_that_exactly_reaches_an_end(self):
+        self.assertEqual(self.page(start_after_doc='data_000003'), (['4', '5', '6'], True, False))
+        self.assertEqual(self.page(end_before_doc='data_000002'), (['0', '1'], False, True))
+
+    def test_categories_select_fields(self):
+        page = self.firestore.get_specific_run_data_paginated(self.run_title, 2, categories_list=['Speed'])
+        self.assertEqual(page['documents'], [{'Speed': 0.0, 'id': 'data_000000'},
+                                             {'Speed': 1.0, 'id': 'data_000001'}])
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from fsae_backend_app.ld_parser.cache import ldCache
+from fsae_backend_app.ld_parser.data_containers import SCALE_BLOCK, ldChan, ldData
+from fsae_backend_app.ld_parser.summary import KEY_POINT_STATS
+from fsae_backend_app.ld_parser.synthetic import write_ld_file
+
+
+def baseline_scale(raw, shift, mul, scale, dec):
+    # The scaling the parser applied before gain/offset were folded together
+    return (raw / scale * pow(10., -dec) + shift) * mul
+
+
+class ScaleTests(unittest.TestCase):
+
+    def test_int_channels_match_baseline(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = write_ld_file(os.path.join(workdir, 'scale.ld'), num_channs=20, duration=20,
+                                 dtypes=('int16', 'int32'))
+            with ldData.fromfile(path) as ld:
+                for chann in ld.channs:
+                    expected = baseline_scale(chann.raw, chann.shift, chann.mul, chann.scale, chann.dec)
+                    np.testing.assert_array_equal(chann.read(), expected.astype(chann.data_dtype),
+                                                  err_msg=chann.name)
+
+    def test_scaling_factors_match_baseline(self):
+        raw = np.arange(-400, 400, dtype=np.int16)
+        for shift, mul, scale, dec in [(0, 1, 1, 1), (0, 1, 1, 2), (5, 1, 1, 1), (-3, 2, 4, 1), (10, 3, 7, 3)]:
+            chann = ldChan(None, 0, 0, 0, 0, len(raw), np.int16, 10, shift, mul, scale, dec, 'x', 'x', '')
+            expected = baseline_scale(raw, shift, mul, scale, dec)
+            np.testing.assert_array_equal(chann._scale(raw), expected.astype(np.float32),
+                                          err_msg=str((shift, mul, scale, dec)))
+            np.testing.assert_allclose(chann._scale(raw, np.float64), expected, rtol=1e-15)
+
+    def test_offset_scaled_in_blocks_matches_baseline(self):
+        raw = (np.arange(2 * SCALE_BLOCK + 123) % 20000 - 10000).astype(np.int16)
+        chann = ldChan(None, 0, 0, 0, 0, len(raw), np.int16, 10, 7, 3, 1, 1, 'x', 'x', '')
+        expected = baseline_scale(raw, 7, 3, 1, 1)
+        np.testing.assert_array_equal(chann._scale(raw), expected.astype(np.float32))
+        np.testing.assert_allclose(chann._scale(raw, np.float64), expected, rtol=1e-15)
+
+
+class ChunkTests(unittest.TestCase):
+
+    def test_every_block_has_the_requested_dtype(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            # Channel 1 stops after 3 of the 10 seconds, so later blocks hold channel 0 alone
+            path = write_ld_file(os.path.join(workdir, 'chunks.ld'), num_channs=2, duration=10, rates=(10,),
+                                 dtypes=('float16', 'int16'), durations={1: 3})
+            with ldData.fromfile(path) as ld:
+                for dtype, expected in [(None, np.float32), (np.float64, np.float64), (np.float16, np.float16)]:
+                    blocks = [block for _, block in ld.iter_chunks(ld.channs, rows=16, dtype=dtype)]
+                    self.assertEqual({block.dtype for block in blocks}, {np.dtype(expected)}, dtype)
+                    data = np.concatenate(blocks)
+                    self.assertEqual(data.shape, (100, 2))
+                    np.testing.assert_array_equal(data[:, 0], ld.channs[0].read().astype(expected))
+                    self.assertTrue(np.isnan(data[30:, 1]).all())
+
+
+class KeyPointTests(unittest.TestCase):
+
+    def test_laps_counts_every_lap_of_a_counter(self):
+        laps = KEY_POINT_STATS['laps']
+        # Five laps, whether the counter starts at 1 or at 0
+        self.assertEqual(laps(np.repeat(np.arange(1, 6), 100).astype(np.float32)), 5)
+        self.assertEqual(laps(np.repeat(np.arange(0, 5), 100).astype(np.float32)), 5)
+        # A counter flickering at a lap boundary does not add laps
+        self.assertEqual(laps(np.array([1, 1, 2, 1, 2, 2, 3, 2, 3], dtype=np.float32)), 3)
+
+
+class CacheTests(unittest.TestCase):
+
+    def test_stored_file_is_returned_from_its_entry(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = write_ld_file(os.path.join(workdir, 'cached.ld'), num_channs=8, duration=10)
+            cache = ldCache(os.path.join(workdir, 'cache'))
+            with ldData.fromfile(path) as direct, ldData.fromfile(path, use_mmap=True, cache=cache) as stored:
+                # Channel data comes from the entry already written, not scaled again
+                self.assertTrue(all(chann._data is not None for chann in stored.channs))
+                for expected, chann in zip(direct.channs, stored.channs):
+                    np.testing.assert_array_equal(chann.data, expected.data, err_msg=chann.name)
@@ -0,0 +1,37 @@
+import base64
+import json
+import unittest
+from fsae_backend_app.pagination import AFTER, BEFORE, decode_cursor, encode_cursor
+
+RUN = '2024-11-23-endurance-1-hz'
+
+
+def token(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+class CursorTests(unittest.TestCase):
+
+    def test_round_trip(self):
+        for direction in (AFTER, BEFORE):
+            for doc_id in ('data_000000', 'data_001199', 'ä/=+'):
+                cursor = encode_cursor(RUN, direction, doc_id)
+                self.assertNotIn('=', cursor)
+                self.assertEqual(decode_cursor(cursor, RUN), (direction, doc_id))
+
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in ('', 'not a cursor', '!!!!', token('data_000001'), token([RUN, AFTER]),
+                       base64.urlsafe_b64encode(b'\xff\xfe').decode()):
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                decode_cursor(cursor, RUN)
+
+    def test_tampered_cursors_are_rejected(self):
+        for payload in ([RUN, 'sideways', 'data_000001'], [RUN, AFTER, 1], [RUN, AFTER, None],
+                        [None, AFTER, 'data_000001']):
+            with self.subTest(payload=payload), self.assertRaises(ValueError):
+                decode_cursor(token(payload), RUN)
+
+    def test_cursor_of_another_run_is_rejected(self):
+        cursor = encode_cursor('2024-11-24-endurance-1-hz', AFTER, 'data_000001')
+        with self.assertRaises(ValueError):
+            decode_cursor(cursor, RUN)
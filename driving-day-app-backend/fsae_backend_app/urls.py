@@ -20,6 +20,13 @@ urlpatterns = [
     path('general-run-data', get_general_run_data_call, name='general-run-data'),
     path('specific-run-data', get_specific_run_data_call, name='specific-run-data'),
     path('specific-run-data-paginated', get_specific_run_data_paginated_call, name='specific-run-data-paginated'),
+    path('run-summary', get_run_summary_call, name='run-summary'),
+    path('packed-run-data', get_packed_run_data_call, name='packed-run-data'),
+    path('chart-series', get_chart_series_call, name='chart-series'),
+    path('compare-runs', get_run_comparison_call, name='compare-runs'),
     path('all-issues', get_all_issues_call, name='all-issues'),
+    path('ingestion-job/<int:job_id>', get_ingestion_job_call, name='ingestion-job'),
+    path('ingestion-jobs', get_ingestion_jobs_call, name='ingestion-jobs'),
+    path('run-data-cache-stats', get_run_data_cache_stats_call, name='run-data-cache-stats'),
     path('get-csrf-token', get_csrf_token, name='get-csrf-token'),
 ]
\ No newline at end of file
@@ -1,13 +1,22 @@
-from django.http import JsonResponse, Http404
-from .ld_parser.main import process_and_upload_inputted_ld_file
+from django.http import JsonResponse, Http404, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from .jobs import enqueue_ld_file, get_job, get_recent_jobs
+from .run_cache import acached_run_data, cache_stats, prefetch_run_data
+from .pagination import AFTER, BEFORE, decode_cursor, encode_cursor
+import asyncio
 import json
+import numpy as np
 from .firebase.firestore import *
+from .firebase import firestore_async
 from asgiref.sync import sync_to_async
 from django.views.decorators.csrf import ensure_csrf_cookie, csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
 from django.middleware.csrf import get_token
 from django.conf import settings
-from .aws import upload_to_s3, get_s3_client, delete_s3_folder
+from .aws import upload_to_s3, get_s3_client, delete_s3_folder, fetch_from_s3
+from .comparison import align_runs
+from .decimation import decimate_mean, lttb, min_max
 from botocore.exceptions import ClientError
 
 @ensure_csrf_cookie
@@ -43,7 +52,7 @@ async def add_driver_call(request):
     """
     try:
         data = json.loads(request.body.decode('utf-8'))
-        await sync_to_async(add_driver)(data)
+        await firestore_async.add_driver(data)
         return JsonResponse({"message": "User registration successful!"}, status=200)
     except Exception as e:
         return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
@@ -64,9 +73,7 @@ async def get_all_drivers_call(request):
         if int(weight) != -1:
             filters['weight'] = float(weight)
         
-        get_all_drivers_async = sync_to_async(get_all_drivers)
-
-        drivers = await get_all_drivers_async(filters=filters if filters else None)
+        drivers = await firestore_async.get_all_drivers(filters=filters if filters else None)
 
         return JsonResponse({
             "drivers": drivers,
@@ -86,22 +93,21 @@ async def upload_files_call(request):
     """
     Handle the POST request to upload and process LD files.
 
-    This view function processes LD files from the specified input directory, converts
-    them into DataFrames, and saves the resulting data as CSV files in the output directory.
-    After saving, each CSV file is uploaded to Firestore for further use.
+    This view function saves the uploaded LD file and queues an ingestion job for it. The
+    job parses the file and uploads it to Firestore in the background, so the request
+    returns as soon as the file is stored, however long the run is.
 
     Request Method:
-        POST: Triggers the `process_and_upload_inputted_ld_files` function to convert and upload
-        all LD files in the input directory. 
+        POST: Persists the LD file and enqueues it with `enqueue_ld_file`.
 
     Returns:
         JsonResponse: A JSON response indicating success or failure of the upload process.
-        - On Success: Returns a JSON message with HTTP 200 status indicating that the data upload
-          was successful.
-        - On Failure: Returns an error message with HTTP 400 status if a non-POST request is made.
+        - On Success: Returns a JSON message and the queued job's ID with HTTP 200 status.
+          Poll /api/ingestion-job/<jobId> for its progress.
+        - On Failure: Returns an error message with HTTP 500 status.
 
     Example:
-        POST /api/upload-files/ -> Triggers the upload process and returns success status.
+        POST /api/upload-files/ -> Queues the upload and returns its job ID.
 
     """
     try:
@@ -121,12 +127,59 @@ async def upload_files_call(request):
 
         # Upload to S3
         # Obtain Image URLs:
-        await sync_to_async(process_and_upload_inputted_ld_file)(data_file, run_date, run_title, driver_id)
-        return JsonResponse({"message": "Successfully uploaded LD data to database!"}, status=200)
+        job = await sync_to_async(enqueue_ld_file)(data_file, run_date, run_title, driver_id)
+        return JsonResponse({
+            "message": "LD data received and queued for upload to database!",
+            "jobId": job.id
+        }, status=200)
+    except Exception as e:
+        return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
+
+
+@require_GET
+async def get_ingestion_job_call(request, job_id):
+    """
+    Report the status and progress of an ingestion job queued by an upload.
+
+    Example:
+        GET /api/ingestion-job/12 -> {"job": {"jobId": 12, "status": "running", "progress": 0.4, ...}}
+    """
+    try:
+        job = await sync_to_async(get_job)(job_id)
+        if job is None:
+            return JsonResponse({"error": f"Ingestion job {job_id} not found"}, status=404)
+        return JsonResponse({"job": job.to_dict()}, status=200)
+    except Exception as e:
+        return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
+
+
+@require_GET
+async def get_ingestion_jobs_call(request):
+    """
+    List the most recent ingestion jobs, newest first.
+
+    Example:
+        GET /api/ingestion-jobs?limit=20 -> {"jobs": [...]}
+    """
+    try:
+        limit = int(request.GET.get('limit', 20))
+        jobs = await sync_to_async(get_recent_jobs)(limit)
+        return JsonResponse({"jobs": [job.to_dict() for job in jobs]}, status=200)
     except Exception as e:
         return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
 
 
+@require_GET
+def get_run_data_cache_stats_call(request):
+    """
+    Report how many run data reads this process served from the cache.
+
+    Example:
+        GET /api/run-data-cache-stats -> {"hits": {"specific": 40}, "misses": {"specific": 3}, "hitRate": 0.93, ...}
+    """
+    return JsonResponse(cache_stats(), status=200)
+
+
 @require_POST
 @csrf_exempt
 def upload_s3_image_call(request):
@@ -224,15 +277,89 @@ async def get_general_run_data_call(request):
     """
 
     try:
-        data = await sync_to_async(get_general_run_data)(filter_limit=10)
+        data = await acached_run_data(
+            'general', None, {"filterLimit": 10},
+            lambda: firestore_async.get_general_run_data(filter_limit=10))
         
         return JsonResponse({"recentRuns": data}, status=200)
     except Exception as e:
         return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
 
 
+def ndjson_response(rows, batch_size=200):
+    """
+    Stream `rows` as newline-delimited JSON, serializing them as they are produced.
+
+    Rows are serialized `batch_size` at a time, so memory stays flat however many there are
+    and the client receives the first rows as soon as they are read. `rows` may be an async
+    iterable, which is what should be passed under ASGI so the event loop is never blocked;
+    under WSGI, Django would have to collect an async iterable before sending it, so pass a
+    plain one. An error part way through ends the stream with an {"error": ...} line, since
+    the status has already been sent.
+    """
+    def flush(batch):
+        return '\n'.join(json.dumps(row, cls=DjangoJSONEncoder) for row in batch) + '\n'
+
+    def error(e):
+        return {"error": f"An unexpected error occurred: {str(e)}"}
+
+    def chunks():
+        batch = []
+        try:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    yield flush(batch)
+                    batch = []
+        except Exception as e:
+            batch.append(error(e))
+        if batch:
+            yield flush(batch)
+
+    async def achunks():
+        batch = []
+        try:
+            async for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    yield flush(batch)
+                    batch = []
+        except Exception as e:
+            batch.append(error(e))
+        if batch:
+            yield flush(batch)
+
+    content = achunks() if hasattr(rows, '__aiter__') else chunks()
+    return StreamingHttpResponse(content, content_type='application/x-ndjson')
+
+
+async def run_key_points(run_title):
+    """
+    The key point statistics of a run, computed at ingestion (see settings.RUN_KEY_POINTS).
+
+    They are a separate read of the run document, made concurrently with the read of the
+    run's data, once per ingestion of the run and then served from the run data cache.
+    """
+    key_points = await acached_run_data('key-points', run_title, {},
+                                        lambda: firestore_async.get_run_key_points(run_title))
+    return key_points if key_points is not None else {}
+
+
 @require_GET
 async def get_specific_run_data_call(request):
+    """
+    Handle the GET request to retrieve the per-second documents of a run.
+
+    With `stream=ndjson`, documents are streamed one JSON object per line as they arrive
+    from Firestore instead of being collected into one response, so memory stays flat and
+    the client can start rendering straight away. Streamed reads bypass the run data cache.
+
+    Example:
+        GET /api/specific-run-data?runTitle=2024-11-23-endurance-1-hz&categories=Speed&stream=ndjson
+            -> {"Speed": 10.4, "id": "data_000000"}
+               {"Speed": 11.2, "id": "data_000001"}
+               ...
+    """
     try:
         run_title = request.GET.get('runTitle')
         categories = request.GET.get('categories')
@@ -241,10 +368,18 @@ async def get_specific_run_data_call(request):
         if len(categories) > 0:
             categories_list = categories.strip().split(",")
 
-        data = await sync_to_async(get_specific_run_data)(run_title, categories_list)
-        key_points = {
-            "Highest Coolant Temperature": "-100"
-        }
+        if request.GET.get('stream') == 'ndjson':
+            if isinstance(request, ASGIRequest):
+                rows = firestore_async.stream_specific_run_data(run_title, categories_list)
+            else:
+                rows = stream_specific_run_data(run_title, categories_list)
+            return ndjson_response(rows)
+
+        data, key_points = await asyncio.gather(
+            acached_run_data(
+                'specific', run_title, {"categories": categories_list},
+                lambda: firestore_async.get_specific_run_data(run_title, categories_list)),
+            run_key_points(run_title))
 
         return JsonResponse({"runDataPoints": data, "keyPoints": key_points}, status=200)
     except Exception as e:
@@ -253,23 +388,309 @@ async def get_specific_run_data_call(request):
 
 @require_GET
 async def get_specific_run_data_paginated_call(request):
+    """
+    Handle the GET request to retrieve one page of the per-second documents of a run.
+
+    Responses include opaque `nextCursor` and `prevCursor` tokens (null at either end of
+    the run); passing one back as `cursor` returns the page after or before this one.
+
+    Query Parameters:
+        runTitle: The run document name.
+        pageSize: The number of documents per page.
+        categories: Comma separated channel names; all channels if empty.
+        cursor (optional): A `nextCursor` or `prevCursor` from a previous page. The first
+            page is returned if it is omitted, along with startAfterDoc and endBeforeDoc.
+        startAfterDoc, endBeforeDoc (optional): A document ID to page after or before, for
+            clients that track document IDs themselves.
+        prefetch (optional): "true" to also load the following page, in the direction
+            being paged, into the run data cache in the background.
+
+    Example:
+        GET /api/specific-run-data-paginated?runTitle=2024-11-23-endurance-1-hz&pageSize=100&categories=Speed
+            -> {"runDataPoints": [...], "keyPoints": {...}, "nextCursor": "WyIy...", "prevCursor": null}
+    """
     try:
         run_title = request.GET.get('runTitle')
-        page_size = request.GET.get('pageSize')
-        start_after_doc = request.GET.get('startAfterDoc')
-        end_before_doc = request.GET.get('endBeforeDoc')
+        page_size = int(request.GET.get('pageSize'))
+        start_after_doc = request.GET.get('startAfterDoc') or ''
+        end_before_doc = request.GET.get('endBeforeDoc') or ''
+        cursor = request.GET.get('cursor')
         categories = request.GET.get('categories')
 
         categories_list = []
         if len(categories) > 0:
             categories_list = categories.strip().split(",")
 
-        data = await sync_to_async(get_specific_run_data_paginated)(run_title, page_size, start_after_doc, end_before_doc, categories_list)
-        key_points = {
-            "Highest Coolant Temperature": "-100"
-        }
+        if cursor:
+            try:
+                direction, doc_id = decode_cursor(cursor, run_title)
+            except ValueError as ve:
+                return JsonResponse({"error": str(ve)}, status=400)
+            start_after_doc, end_before_doc = (doc_id, '') if direction == AFTER else ('', doc_id)
+
+        def page(after, before):
+            return ('paginated', run_title,
+                    {"pageSize": page_size, "startAfterDoc": after, "endBeforeDoc": before,
+                     "categories": categories_list},
+                    lambda: firestore_async.get_specific_run_data_paginated(
+                        run_title, page_size, after, before, categories_list))
+
+        data, key_points = await asyncio.gather(
+            acached_run_data(*page(start_after_doc, end_before_doc)), run_key_points(run_title))
+        if data is None:
+            return JsonResponse({"error": "Failed to retrieve run data"}, status=500)
+
+        documents = data["documents"]
+        next_cursor = prev_cursor = None
+        if documents and data["hasNext"]:
+            next_cursor = encode_cursor(run_title, AFTER, documents[-1]['id'])
+        if documents and data["hasPrevious"]:
+            prev_cursor = encode_cursor(run_title, BEFORE, documents[0]['id'])
+
+        if request.GET.get('prefetch') == 'true':
+            backward = not start_after_doc and end_before_doc
+            if backward and prev_cursor:
+                prefetch_run_data(*page('', documents[0]['id']))
+            elif not backward and next_cursor:
+                prefetch_run_data(*page(documents[-1]['id'], ''))
 
-        return JsonResponse({"runDataPoints": data, "keyPoints": key_points}, status=200)
+        return JsonResponse({
+            "runDataPoints": documents,
+            "keyPoints": key_points,
+            "nextCursor": next_cursor,
+            "prevCursor": prev_cursor
+        }, status=200)
+    except Exception as e:
+        return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
+
+
+@require_GET
+async def get_run_summary_call(request):
+    """
+    Handle the GET request to retrieve the min/max/mean rollups of a run for overview charts.
+
+    Query Parameters:
+        runTitle: The run document name.
+        resolution (optional): The bucket width in seconds (1, 10 or 60); all widths if omitted.
+        categories (optional): Comma separated channel names; all channels if omitted.
+
+    Example:
+        GET /api/run-summary?runTitle=2024-11-23-endurance-100-hz&resolution=10&categories=Speed
+            -> {"runSummary": {"10": {"time": [0, 10, ...], "channels": {"Speed": {"min": [...], ...}}}}}
+    """
+    try:
+        run_title = request.GET.get('runTitle')
+        resolution = request.GET.get('resolution')
+        categories = request.GET.get('categories', '')
+
+        categories_list = []
+        if len(categories) > 0:
+            categories_list = categories.strip().split(",")
+
+        data = await acached_run_data(
+            'summary', run_title, {"resolution": resolution, "categories": categories_list},
+            lambda: firestore_async.get_run_summary(run_title, resolution, categories_list))
+        if data is None:
+            return JsonResponse({"error": "Failed to retrieve run summary"}, status=500)
+
+        return JsonResponse({"runSummary": data}, status=200)
+    except Exception as e:
+        return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
+
+
+@require_GET
+async def get_packed_run_data_call(request):
+    """
+    Handle the GET request to retrieve full-rate samples of a few channels of a run.
+
+    Reads the channel-major packed segments, so a channel costs one read per segment rather
+    than one per second, and only the segments in the requested window are read. Samples
+    are averaged down server-side to the requested resolution.
+
+    Query Parameters:
+        runTitle: The run document name.
+        categories: Comma separated channel names.
+        start, end (optional): The time window in seconds; the whole run if omitted.
+        resolution (optional): Seconds per returned point; the run's own rate if omitted.
+
+    Example:
+        GET /api/packed-run-data?runTitle=2024-11-23-endurance-100-hz&categories=Speed&start=60&end=120&resolution=0.1
+            -> {"frequency": 10.0, "start": 60.0, "channels": {"Speed": [...]}}
+    """
+    try:
+        run_title = request.GET.get('runTitle')
+        categories = request.GET.get('categories', '')
+        start = request.GET.get('start')
+        end = request.GET.get('end')
+        resolution = request.GET.get('resolution')
+
+        categories_list = []
+        if len(categories) > 0:
+            categories_list = categories.strip().split(",")
+
+        data = await sync_to_async(get_packed_run_data, thread_sensitive=False)(
+            run_title, categories_list,
+            start=float(start) if start else None,
+            end=float(end) if end else None,
+            fetch_segment=fetch_from_s3)
+        if data is None:
+            return JsonResponse({"error": "Failed to retrieve packed run data"}, status=500)
+
+        factor = max(1, round(float(resolution) * data["frequency"])) if resolution else 1
+        channels = await sync_to_async(lambda: {
+            name: rounded_floats(decimate_mean(values, factor)) for name, values in data["channels"].items()
+        }, thread_sensitive=False)()
+        return JsonResponse({
+            "frequency": data["frequency"] / factor,
+            "start": data["start"],
+            "channels": channels
+        }, status=200)
+    except RunNotFound as e:
+        return JsonResponse({"error": str(e)}, status=404)
+    except Exception as e:
+        return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
+
+
+@require_GET
+async def get_chart_series_call(request):
+    """
+    Handle the GET request to retrieve chart-ready series of a few channels of a run.
+
+    Each channel is reduced server-side, from its full-rate packed segments, to at most the
+    requested number of points while keeping its visual shape, so charts download and draw
+    only what they can display. Zooming in is a request for a narrower window, which is
+    returned at the same density.
+
+    Query Parameters:
+        runTitle: The run document name.
+        categories: Comma separated channel names.
+        start, end (optional): The time window in seconds; the whole run if omitted.
+        points (optional): The maximum number of points per channel. Defaults to 1000.
+        method (optional): "lttb" (Largest-Triangle-Three-Buckets, the default) or "minmax"
+            (the min and max of each bucket, which never drops a spike).
+
+    Example:
+        GET /api/chart-series?runTitle=2024-11-23-endurance-100-hz&categories=Speed&start=60&end=120&points=500
+            -> {"method": "lttb", "channels": {"Speed": {"time": [60.0, ...], "values": [...]}}}
+    """
+    try:
+        run_title = request.GET.get('runTitle')
+        categories = request.GET.get('categories', '')
+        start = request.GET.get('start')
+        end = request.GET.get('end')
+        points = int(request.GET.get('points', 1000))
+        method = request.GET.get('method', 'lttb')
+
+        decimate = {'lttb': lttb, 'minmax': min_max}.get(method)
+        if decimate is None:
+            return JsonResponse({"error": f"Unknown method '{method}', expected 'lttb' or 'minmax'"}, status=400)
+
+        categories_list = []
+        if len(categories) > 0:
+            categories_list = categories.strip().split(",")
+
+        data = await sync_to_async(get_packed_run_data, thread_sensitive=False)(
+            run_title, categories_list,
+            start=float(start) if start else None,
+            end=float(end) if end else None,
+            fetch_segment=fetch_from_s3)
+        if data is None:
+            return JsonResponse({"error": "Failed to retrieve packed run data"}, status=500)
+
+        def reduce_channels():
+            channels = {}
+            for name, values in data["channels"].items():
+                kept = decimate(values, points)
+                channels[name] = {
+                    "time": np.round(data["start"] + kept / data["frequency"], 6).tolist(),
+                    "values": rounded_floats(values[kept]),
+                }
+            return channels
+
+        channels = await sync_to_async(reduce_channels, thread_sensitive=False)()
+        return JsonResponse({"method": method, "channels": channels}, status=200)
+    except RunNotFound as e:
+        return JsonResponse({"error": str(e)}, status=404)
+    except Exception as e:
+        return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
+
+
+@require_GET
+async def get_run_comparison_call(request):
+    """
+    Handle the GET request to compare channels of several runs on one shared axis.
+
+    The runs' full-rate packed segments are read concurrently, so comparing several runs
+    takes about as long as reading the slowest one. Each channel is then resampled onto an
+    evenly spaced axis of seconds from the start of each run, or of distance, so the runs
+    line up point for point. Positions a run does not reach are null.
+
+    Query Parameters:
+        runTitles: Comma separated run document names.
+        categories: Comma separated channel names.
+        align (optional): "time" (the default) or "distance".
+        distanceChannel (optional): The channel to align on with align=distance. Defaults
+            to "Distance".
+        start, end (optional): The range of the axis, in seconds or distance units; by
+            default it spans every run.
+        points (optional): The number of axis positions. Defaults to 1000.
+
+    Example:
+        GET /api/compare-runs?runTitles=2024-11-23-endurance-100-hz,2024-11-24-endurance-100-hz&categories=Speed
+            -> {"align": "time", "axis": [0.0, 0.6, ...],
+                "runs": {"2024-11-23-endurance-100-hz": {"Speed": [...]}, ...}}
+    """
+    try:
+        run_titles = [t for t in request.GET.get('runTitles', '').strip().split(",") if t]
+        categories = request.GET.get('categories', '')
+        align = request.GET.get('align', 'time')
+        distance_channel = request.GET.get('distanceChannel', 'Distance')
+        start = request.GET.get('start')
+        end = request.GET.get('end')
+        points = int(request.GET.get('points', 1000))
+
+        categories_list = []
+        if len(categories) > 0:
+            categories_list = categories.strip().split(",")
+
+        if not run_titles or not categories_list:
+            return JsonResponse({"error": "runTitles and categories are required"}, status=400)
+        if align not in ('time', 'distance'):
+            return JsonResponse({"error": f"Unknown align '{align}', expected 'time' or 'distance'"}, status=400)
+        if points < 2:
+            return JsonResponse({"error": "points must be at least 2"}, status=400)
+
+        start = float(start) if start else None
+        end = float(end) if end else None
+        if align == 'time':
+            # Only the segments inside the window are read
+            fetched, window = categories_list, {"start": start, "end": end}
+        else:
+            fetched, window = list(dict.fromkeys(categories_list + [distance_channel])), {}
+
+        load = sync_to_async(get_packed_run_data, thread_sensitive=False)
+        runs = await asyncio.gather(*[load(title, fetched, fetch_segment=fetch_from_s3, **window)
+                                      for title in run_titles])
+        for title, run in zip(run_titles, runs):
+            if run is None:
+                return JsonResponse({"error": f"Failed to retrieve packed run data for {title}"}, status=500)
+
+        def compare():
+            axis, aligned = align_runs(dict(zip(run_titles, runs)), categories_list, points,
+                                       distance_channel if align == 'distance' else None, start, end)
+            return np.round(axis, 6).tolist(), {
+                title: {name: rounded_floats(values) for name, values in channels.items()}
+                for title, channels in aligned.items()
+            }
+
+        try:
+            axis, aligned = await sync_to_async(compare, thread_sensitive=False)()
+        except ValueError as ve:
+            return JsonResponse({"error": str(ve)}, status=400)
+
+        return JsonResponse({"align": align, "axis": axis, "runs": aligned}, status=200)
+    except RunNotFound as e:
+        return JsonResponse({"error": str(e)}, status=404)
     except Exception as e:
         return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
 
@@ -282,7 +703,7 @@ async def add_issue_call(request):
     """
     try:
         data = json.loads(request.body.decode('utf-8'))
-        result = await sync_to_async(add_issue)(data)
+        result = await firestore_async.add_issue(data)
         
         if result is None:
             return JsonResponse({"error": "Failed to create issue"}, status=400)
@@ -311,7 +732,7 @@ async def get_all_issues_call(request):
         if subsystem_filter:
             filters['subsystem'] = subsystem_filter
         
-        issues = await sync_to_async(get_all_issues)(filters if filters else None)
+        issues = await firestore_async.get_all_issues(filters if filters else None)
         
         if issues is None:
             return JsonResponse({"error": "Failed to retrieve issues"}, status=500)
@@ -333,7 +754,7 @@ async def update_issue_call(request, issue_id):
     if request.method == 'PUT':
         try:
             data = json.loads(request.body.decode('utf-8'))
-            result = await sync_to_async(update_issue)(issue_id, data)
+            result = await firestore_async.update_issue(issue_id, data)
             
             if result is None:
                 return JsonResponse({"error": "Failed to update issue or issue not found"}, status=400)
@@ -369,12 +790,12 @@ async def delete_issue_call(request, issue_id):
     """
     if request.method == 'DELETE':
         try:
-            result = await sync_to_async(delete_issue)(issue_id)
+            result = await firestore_async.delete_issue(issue_id)
             
             if result is None:
                 return JsonResponse({"error": "Failed to delete issue or issue not found"}, status=404)
 
-            await sync_to_async(delete_s3_folder)(f"issues/{issue_id}/")
+            await sync_to_async(delete_s3_folder, thread_sensitive=False)(f"issues/{issue_id}/")
         
             return JsonResponse({
                 "message": "Issue deleted successfully!",